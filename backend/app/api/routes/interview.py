@@ -2,23 +2,36 @@
 
 import os
 import uuid
+import asyncio
 import json
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from typing import Dict, Any
-
-from app.services.speech_to_text import transcribe_video_file
-from app.services.face_analysis import analyze_video_emotions
-from app.services.gemini_client import score_answer_gemini
+import time
+from typing import Literal, Optional
+
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.services.answer_pipeline import process_answer
+from app.services.answer_jobs import AnswerJob, QueueFullError, answer_jobs
+from app.services.report_service import start_report_precompute
+from app.services.resumable_uploads import (
+    ResumableUploads,
+    UploadBusyError,
+    UploadNotFoundError,
+    UploadOffsetError,
+)
+from app.services.session_store import create_session, session_exists, update_session
+from app.services.uploads import UploadTooLargeError, save_upload
 
 
 router = APIRouter()
 
-SESSIONS_DIR = "sessions"
 UPLOADS_DIR = "uploads"
 
-os.makedirs(SESSIONS_DIR, exist_ok=True)
 os.makedirs(UPLOADS_DIR, exist_ok=True)
 
+resumable_uploads = ResumableUploads(UPLOADS_DIR, ttl_s=settings.RESUMABLE_UPLOAD_TTL_S)
+
 
 # ---------------------------------------------------------------------
 #  START INTERVIEW (Generate Questions is already done in setup)
@@ -38,15 +51,7 @@ async def start_interview(role: str = Form(...), seniority: str = Form(...), que
     except:
         raise HTTPException(400, "Invalid question format")
 
-    session_path = os.path.join(SESSIONS_DIR, f"{session_id}.json")
-
-    with open(session_path, "w", encoding="utf-8") as f:
-        json.dump({
-            "session_id": session_id,
-            "role": role,
-            "seniority": seniority,
-            "questions": []
-        }, f, indent=2)
+    await asyncio.to_thread(create_session, session_id, role, seniority)
 
     return {
         "session_id": session_id,
@@ -63,91 +68,206 @@ async def save_answer(
     session_id: str = Form(...),
     question_id: str = Form(...),
     question_text: str = Form(...),
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    mode: Literal["sync", "job"] = Form("sync"),
+    priority: int = Form(5),
 ):
     """
     Receives a video blob recording from frontend.
-    Saves → transcribes → scores → emotion analysis → stores in session file
+    Saves → (transcribe → score) alongside emotion analysis → stores in session file
+
+    mode="sync" (default) answers when processing is done.
+    mode="job" acknowledges with 202 + job_id once the video is on disk;
+    poll GET /answer/{job_id} for the result. Lower priority runs first.
+    Jobs are held in the accepting process, so mode="job" assumes a single
+    API worker. Any other mode is rejected with 422.
     """
 
     # Validate session exists
-    session_path = os.path.join(SESSIONS_DIR, f"{session_id}.json")
-    if not os.path.exists(session_path):
+    if not await asyncio.to_thread(session_exists, session_id):
         raise HTTPException(404, "Session not found")
 
     # Save uploaded video
-    session_upload_dir = os.path.join(UPLOADS_DIR, session_id)
-    os.makedirs(session_upload_dir, exist_ok=True)
+    video_path = os.path.join(UPLOADS_DIR, session_id, f"{question_id}.webm")
+
+    # Hashed while streaming to disk: identical re-uploads (client
+    # retries) reuse cached transcript and emotion results
+    try:
+        saved = await save_upload(file, video_path, settings.MAX_ANSWER_UPLOAD_BYTES)
+    except UploadTooLargeError as e:
+        raise HTTPException(413, str(e))
+
+    return await _dispatch_answer(
+        session_id, question_id, question_text, video_path, saved.sha256, mode, priority
+    )
+
+
+async def _dispatch_answer(
+    session_id: str,
+    question_id: str,
+    question_text: str,
+    video_path: str,
+    content_hash: str,
+    mode: str,
+    priority: int,
+):
+    """Processes a saved answer video now, or queues it when mode="job"."""
+    if mode == "job":
+        job = AnswerJob(session_id, question_id, question_text, video_path, priority, content_hash)
+        try:
+            answer_jobs.submit(job)
+        except QueueFullError:
+            raise HTTPException(503, "Answer queue is full, retry later")
+
+        return JSONResponse(
+            status_code=202,
+            content={
+                "job_id": job.job_id,
+                "status": job.status,
+                "status_url": f"/api/interview/answer/{job.job_id}",
+            },
+        )
 
-    video_path = os.path.join(session_upload_dir, f"{question_id}.webm")
+    return await process_answer(
+        session_id=session_id,
+        question_id=question_id,
+        question_text=question_text,
+        video_path=video_path,
+        content_hash=content_hash,
+    )
 
-    with open(video_path, "wb") as f:
-        f.write(await file.read())
 
-    # ----------------------------------------------------
-    # 1. TRANSCRIBE
-    # ----------------------------------------------------
-    try:
-        transcript = transcribe_video_file(video_path)
-    except Exception as e:
-        transcript = ""
-        print("Transcription failed:", e)
-
-    # ----------------------------------------------------
-    # 2. EMOTION ANALYSIS
-    # ----------------------------------------------------
-    try:
-        emotion_result = analyze_video_emotions(video_path)
-    except Exception as e:
-        emotion_result = {
-            "dominant_emotion": "unknown",
-            "emotion_scores": {}
-        }
-        print("Emotion analysis failed:", e)
-
-    # ----------------------------------------------------
-    # 3. SCORING WITH GEMINI
-    # ----------------------------------------------------
+# ---------------------------------------------------------------------
+#  RESUMABLE ANSWER UPLOADS
+#
+#  POST   /uploads                                   → upload_id, offset 0
+#  PUT    /uploads/{session_id}/{upload_id}?offset=N  raw chunk body
+#  GET    /uploads/{session_id}/{upload_id}           → current offset
+#  POST   /uploads/{session_id}/{upload_id}/finalize  → same as POST /answer
+#  DELETE /uploads/{session_id}/{upload_id}
+# ---------------------------------------------------------------------
+
+def _upload_error(e: Exception) -> HTTPException:
+    if isinstance(e, UploadNotFoundError):
+        return HTTPException(404, "Upload not found")
+    if isinstance(e, UploadBusyError):
+        return HTTPException(409, "Upload is in use by another request, retry later")
+    if isinstance(e, UploadOffsetError):
+        return HTTPException(409, {"message": str(e), "offset": e.offset})
+    return HTTPException(413, str(e))
+
+
+@router.post("/uploads")
+async def create_upload(
+    session_id: str = Form(...),
+    question_id: str = Form(...),
+    question_text: str = Form(...),
+    size: Optional[int] = Form(None),
+):
+    """
+    Starts a resumable upload of an answer video. Send the bytes in order
+    with PUT .../{upload_id}?offset=N; after a dropped connection, GET the
+    upload for the offset to resume from.
+    """
+    if not await asyncio.to_thread(session_exists, session_id):
+        raise HTTPException(404, "Session not found")
+
     try:
-        ai_score = await score_answer_gemini(
-            question=question_text,
-            transcript=transcript
-        )
-    except Exception as e:
-        ai_score = {
-            "content_score": 0,
-            "structure_score": 0,
-            "clarity_score": 0,
-            "confidence_score": 0,
-            "feedback": "AI Scoring failed."
-        }
-        print("Gemini scoring failed:", e)
-
-    # ----------------------------------------------------
-    # 4. SAVE INTO SESSION JSON
-    # ----------------------------------------------------
-    with open(session_path, "r", encoding="utf-8") as f:
-        session_data = json.load(f)
-
-    session_data["questions"].append({
-        "question_id": question_id,
-        "question_text": question_text,
-        "transcript": transcript,
-        **ai_score,
-        "expression": emotion_result
-    })
-
-    with open(session_path, "w", encoding="utf-8") as f:
-        json.dump(session_data, f, indent=2)
+        # Off the event loop: creating an upload may sweep expired ones
+        upload = await asyncio.to_thread(resumable_uploads.create, session_id, question_id, question_text, size)
+    except UploadTooLargeError as e:
+        raise _upload_error(e)
 
     return {
-        "message": "Answer saved successfully",
-        "transcript": transcript,
-        "emotion": emotion_result,
-        "scores": ai_score
+        **upload,
+        "chunk_size": settings.UPLOAD_CHUNK_BYTES,
+        "upload_url": f"/api/interview/uploads/{session_id}/{upload['upload_id']}",
     }
 
 
+@router.put("/uploads/{session_id}/{upload_id}")
+async def append_upload_chunk(
+    session_id: str,
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+):
+    """
+    Appends the raw request body at `offset`. A wrong offset gets 409
+    with the current one.
+    """
+    try:
+        new_offset = await resumable_uploads.append(session_id, upload_id, offset, request.stream())
+    except (UploadNotFoundError, UploadBusyError, UploadOffsetError, UploadTooLargeError) as e:
+        raise _upload_error(e)
+    return {"upload_id": upload_id, "offset": new_offset}
+
+
+@router.get("/uploads/{session_id}/{upload_id}")
+async def get_upload(session_id: str, upload_id: str):
+    try:
+        return resumable_uploads.status(session_id, upload_id)
+    except UploadNotFoundError as e:
+        raise _upload_error(e)
+
+
+@router.post("/uploads/{session_id}/{upload_id}/finalize")
+async def finalize_upload(
+    session_id: str,
+    upload_id: str,
+    mode: Literal["sync", "job"] = Form("sync"),
+    priority: int = Form(5),
+):
+    """
+    Moves the completed upload into place as the answer video and
+    processes it exactly like POST /answer (including mode="job").
+    """
+    try:
+        upload = resumable_uploads.status(session_id, upload_id)
+        video_path = os.path.join(UPLOADS_DIR, session_id, f"{os.path.basename(upload['question_id'])}.webm")
+        meta, saved = await resumable_uploads.finalize(session_id, upload_id, video_path)
+    except (UploadNotFoundError, UploadBusyError, UploadOffsetError) as e:
+        raise _upload_error(e)
+
+    return await _dispatch_answer(
+        session_id, meta["question_id"], meta["question_text"], video_path, saved.sha256, mode, priority
+    )
+
+
+@router.delete("/uploads/{session_id}/{upload_id}")
+async def abort_upload(session_id: str, upload_id: str):
+    try:
+        resumable_uploads.abort(session_id, upload_id)
+    except UploadNotFoundError as e:
+        raise _upload_error(e)
+    return {"upload_id": upload_id, "status": "aborted"}
+
+
+@router.get("/answer/{job_id}")
+async def get_answer_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, description="Seconds to long-poll for completion"),
+):
+    """
+    Status of a queued answer. With ?wait=N the request is held until
+    the job finishes or N seconds pass (capped by ANSWER_JOB_MAX_WAIT_S).
+    """
+    job = answer_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(404, "Job not found")
+
+    await answer_jobs.wait(job, min(wait, settings.ANSWER_JOB_MAX_WAIT_S))
+    return job.to_dict()
+
+
+@router.get("/jobs/stats")
+async def answer_job_stats():
+    """
+    Queue depth and wait times, for sizing ANSWER_JOB_WORKERS.
+    """
+    return answer_jobs.stats()
+
+
 # ---------------------------------------------------------------------
 #  END INTERVIEW
 # ---------------------------------------------------------------------
@@ -155,14 +275,16 @@ async def save_answer(
 @router.post("/end")
 async def end_interview(session_id: str = Form(...)):
     """
-    (Optional) Marks the session as complete.
+    Marks the session as complete and starts building the report
+    (overall scores, AI summary, PDF) in the background.
     """
 
-    session_path = os.path.join(SESSIONS_DIR, f"{session_id}.json")
-
-    if not os.path.exists(session_path):
+    if not await asyncio.to_thread(session_exists, session_id):
         raise HTTPException(404, "Session not found")
 
+    await asyncio.to_thread(update_session, session_id, {"status": "completed", "ended_at": time.time()})
+    start_report_precompute(session_id)
+
     return {
         "message": "Interview session finished",
         "session_id": session_id
@@ -2,19 +2,20 @@
 
 import os
 import uuid
-import json
+import asyncio
 import traceback
 
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 
+from app.core.config import settings
 from app.services.resume_parser import extract_text_from_pdf
 from app.services.question_gen import generate_questions
+from app.services.llm_client import record_fallback
+from app.services.session_store import create_session
+from app.services.uploads import UploadTooLargeError, save_upload
 
 router = APIRouter()
 
-SESSIONS_DIR = "sessions"
-os.makedirs(SESSIONS_DIR, exist_ok=True)
-
 
 @router.post("/upload")
 async def upload_resume(
@@ -26,19 +27,19 @@ async def upload_resume(
     1. Save uploaded resume to a temp folder
     2. Extract text from PDF
     3. Generate interview questions using Gemini
-    4. Create a session file on disk
+    4. Create the session in the session store
     5. Return session_id + questions
     """
 
     # 1) Save file
     try:
-      os.makedirs("app/storage/tmp", exist_ok=True)
       tmp_path = os.path.join(
           "app/storage/tmp",
-          f"{uuid.uuid4()}_{file.filename}",
+          f"{uuid.uuid4()}_{os.path.basename(file.filename or 'resume.pdf')}",
       )
-      with open(tmp_path, "wb") as f:
-          f.write(await file.read())
+      await save_upload(file, tmp_path, settings.MAX_RESUME_UPLOAD_BYTES)
+    except UploadTooLargeError as e:
+      raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
       print("ERROR: Failed to save uploaded file:", e)
       traceback.print_exc()
@@ -46,7 +47,7 @@ async def upload_resume(
 
     # 2) Extract resume text
     try:
-      resume_text = extract_text_from_pdf(tmp_path)
+      resume_text = await asyncio.to_thread(extract_text_from_pdf, tmp_path)
     except Exception as e:
       print("ERROR: Failed to parse resume PDF:", e)
       traceback.print_exc()
@@ -54,7 +55,7 @@ async def upload_resume(
 
     # 3) Generate questions via Gemini (with fallback)
     try:
-      questions_list = generate_questions(
+      questions_list = await generate_questions(
           resume_text=resume_text,
           role=role,
           seniority=seniority,
@@ -63,6 +64,7 @@ async def upload_resume(
     except Exception as e:
       print("ERROR: generate_questions() failed:", e)
       traceback.print_exc()
+      record_fallback("questions")
 
       # Fallback dummy questions so the endpoint still works
       questions_list = [
@@ -71,24 +73,13 @@ async def upload_resume(
           for i in range(5)
       ]
 
-    # 4) Create a session file on disk
+    # 4) Create the session (answers will be appended in /api/interview/answer)
     session_id = str(uuid.uuid4())
-    session_path = os.path.join(SESSIONS_DIR, f"{session_id}.json")
 
     try:
-      with open(session_path, "w", encoding="utf-8") as f:
-          json.dump(
-              {
-                  "session_id": session_id,
-                  "role": role,
-                  "seniority": seniority,
-                  "questions": [],  # answers will be appended in /api/interview/answer
-              },
-              f,
-              indent=2,
-          )
+      await asyncio.to_thread(create_session, session_id, role, seniority)
     except Exception as e:
-      print("ERROR: Failed to create session file:", e)
+      print("ERROR: Failed to create session:", e)
       traceback.print_exc()
       raise HTTPException(status_code=500, detail=f"Failed to create session: {e}")
 
@@ -0,0 +1,61 @@
+# backend/app/api/routes/sessions.py
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.services.session_index import MAX_PAGE_SIZE, session_index
+
+router = APIRouter()
+
+
+def _epoch(value: Optional[datetime]) -> Optional[float]:
+    """Epoch seconds, as stored in the index; no UTC offset means UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+@router.get("")
+async def list_sessions(
+    role: Optional[str] = None,
+    seniority: Optional[str] = None,
+    created_from: Optional[datetime] = Query(None, description="Created at or after (ISO 8601, UTC unless an offset is given)"),
+    created_to: Optional[datetime] = Query(None, description="Created before (ISO 8601, UTC unless an offset is given)"),
+    min_score: Optional[float] = Query(None, ge=0, le=10),
+    max_score: Optional[float] = Query(None, ge=0, le=10),
+    status: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    """
+    Lists sessions newest first, served from the session index.
+    Path: GET /api/sessions?role=&seniority=&created_from=&created_to=&min_score=&max_score=&limit=&cursor=
+
+    Scores filter on the overall score (mean of the four dimensions).
+    Pass `next_cursor` from the previous page as `cursor` to continue.
+    """
+    try:
+        sessions, next_cursor = await asyncio.to_thread(
+            session_index.search,
+            limit=limit,
+            cursor=cursor,
+            role=role,
+            seniority=seniority,
+            created_from=_epoch(created_from),
+            created_to=_epoch(created_to),
+            min_score=min_score,
+            max_score=max_score,
+            status=status,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return {
+        "sessions": sessions,
+        "next_cursor": next_cursor,
+    }
@@ -0,0 +1,104 @@
+# backend/app/cli.py
+#
+# Maintenance commands. Run from the backend/ directory:
+#   python -m app.cli export --role "product designer" -o cohort.zip
+#   python -m app.cli export 22420bdb-... 2a821f47-... -o reports.zip
+#   python -m app.cli migrate-json --dir sessions
+#   python -m app.cli reindex
+
+import argparse
+import asyncio
+import sys
+
+
+async def _export(args: argparse.Namespace) -> int:
+    from app.services.executors import pdf_pool
+    from app.services.report_export import resolve_session_ids, stream_reports_zip
+
+    session_ids = resolve_session_ids(args.session_ids, args.role, args.seniority)
+    if not session_ids:
+        print("No matching sessions", file=sys.stderr)
+        return 1
+
+    print(f"Exporting {len(session_ids)} session(s) to {args.output}")
+    try:
+        with open(args.output, "wb") as f:
+            async for chunk in stream_reports_zip(session_ids, args.template):
+                f.write(chunk)
+    finally:
+        pdf_pool.shutdown()
+    return 0
+
+
+def _migrate_json(args: argparse.Namespace) -> int:
+    from app.services.session_index import session_index
+    from app.services.sqlite_store import SqliteSessionRepository, iter_json_sessions
+
+    repository = SqliteSessionRepository(args.db)
+    imported = skipped = 0
+    for session_data in iter_json_sessions(args.dir):
+        if not args.replace and repository.exists(session_data["session_id"]):
+            skipped += 1
+            continue
+        repository.import_session(session_data, replace=args.replace)
+        session_index.add_session(session_data)
+        imported += 1
+
+    print(f"Imported {imported} session(s) into {args.db}, skipped {skipped} already present")
+    return 0
+
+
+def _sessions():
+    from app.services.session_store import list_session_ids, load_session
+
+    for session_id in list_session_ids():
+        session_data = load_session(session_id)
+        if session_data is not None:
+            yield session_data
+
+
+def _reindex(args: argparse.Namespace) -> int:
+    from app.services.cohort_store import cohort_store
+    from app.services.session_index import session_index
+
+    count = session_index.rebuild(_sessions())
+    print(f"Indexed {count} session(s)")
+    scored = cohort_store.rebuild(_sessions())
+    print(f"Rebuilt cohort scores for {scored} answered session(s)")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Export session reports as a ZIP of PDFs")
+    export.add_argument("session_ids", nargs="*", help="Session ids (default: all matching the filters)")
+    export.add_argument("--role")
+    export.add_argument("--seniority")
+    export.add_argument("--template", default="detailed", choices=["simple", "detailed"])
+    export.add_argument("-o", "--output", default="interview-reports.zip")
+
+    migrate = commands.add_parser("migrate-json", help="Import sessions/{id}.json files into the SQLite store")
+    migrate.add_argument("--dir", default="sessions", help="Directory holding the JSON session files")
+    migrate.add_argument("--db", default=None, help="Database path (default: SESSION_DB_PATH)")
+    migrate.add_argument("--replace", action="store_true", help="Overwrite sessions already in the database")
+
+    commands.add_parser("reindex", help="Rebuild the session listing index and cohort scores from the session store")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        return asyncio.run(_export(args))
+    if args.command == "migrate-json":
+        if args.db is None:
+            from app.core.config import settings
+            args.db = settings.SESSION_DB_PATH
+        return _migrate_json(args)
+    if args.command == "reindex":
+        return _reindex(args)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
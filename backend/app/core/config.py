@@ -1,14 +1,25 @@
 # backend/app/core/config.py
 
 from pydantic import BaseModel
-from typing import List
+from typing import Any, Dict, List
 import os
+import json
 from dotenv import load_dotenv
 
 # Load .env file
 load_dotenv()
 
 
+def _json_env(name: str, default: Dict[str, Any]) -> Dict[str, Any]:
+    """Reads a JSON object from the environment, merged over `default`."""
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    merged = dict(default)
+    merged.update(json.loads(raw))
+    return merged
+
+
 class Settings(BaseModel):
     PROJECT_NAME: str = "Interview AI Backend"
 
@@ -21,6 +32,109 @@ class Settings(BaseModel):
     # API keys
     GEMINI_API_KEY: str | None = os.getenv("GEMINI_API_KEY")
 
+    # Gemini flow control (per process)
+    # Concurrency adapts (AIMD) between these bounds
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    LLM_MIN_CONCURRENCY: int = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+    # Token bucket: average requests/second and burst size (rate 0 = unlimited)
+    LLM_RATE_PER_S: float = float(os.getenv("LLM_RATE_PER_S", "5"))
+    LLM_BURST: int = int(os.getenv("LLM_BURST", "10"))
+    # Retries with jittered exponential backoff
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    LLM_BACKOFF_BASE_S: float = float(os.getenv("LLM_BACKOFF_BASE_S", "0.5"))
+    LLM_BACKOFF_MAX_S: float = float(os.getenv("LLM_BACKOFF_MAX_S", "8"))
+    # Retry budget: retries earned per call, and the most that can be banked
+    LLM_RETRY_BUDGET_RATIO: float = float(os.getenv("LLM_RETRY_BUDGET_RATIO", "0.2"))
+    LLM_RETRY_BUDGET_MAX: float = float(os.getenv("LLM_RETRY_BUDGET_MAX", "10"))
+    # Overall deadline per call, including retries
+    LLM_DEADLINE_S: float = float(os.getenv("LLM_DEADLINE_S", "60"))
+    # Hedging / circuit breaker per call site (override with a JSON object).
+    # hedge: send a duplicate request after the observed p95 latency
+    # breaker_*: open after this error rate, fail fast for cooldown seconds
+    LLM_SITE_POLICIES: Dict[str, Dict[str, Any]] = _json_env("LLM_SITE_POLICIES", {
+        "default": {"hedge": False, "breaker": True},
+        "scoring": {"hedge": True, "hedge_percentile": 0.95, "breaker": True, "breaker_error_rate": 0.5},
+        "summary": {"hedge": True, "hedge_percentile": 0.95, "breaker": True, "breaker_error_rate": 0.5},
+        "questions": {"hedge": True, "hedge_percentile": 0.95, "breaker": True, "breaker_error_rate": 0.5},
+        # Audio payloads are large; hedging would double upload bandwidth
+        "transcription": {"hedge": False, "breaker": True, "breaker_error_rate": 0.5},
+    })
+
+    # Facial emotion analysis
+    # Number of warm FER/MTCNN detectors kept per process
+    FER_POOL_SIZE: int = int(os.getenv("FER_POOL_SIZE", "2"))
+    # Processes used for video analysis (0 = run in a thread in the API process)
+    VIDEO_WORKERS: int = int(os.getenv("VIDEO_WORKERS", str(max(1, (os.cpu_count() or 2) - 1))))
+    # Seconds before a single video analysis job is abandoned
+    VIDEO_JOB_TIMEOUT_S: float = float(os.getenv("VIDEO_JOB_TIMEOUT_S", "180"))
+    # Target sampling rate and hard frame budget per answer video
+    EMOTION_SAMPLE_FPS: float = float(os.getenv("EMOTION_SAMPLE_FPS", "3"))
+    EMOTION_MAX_FRAMES: int = int(os.getenv("EMOTION_MAX_FRAMES", "150"))
+    # "batched" (vectorized, one model call per batch) or "per_frame" (FER.detect_emotions)
+    EMOTION_INFERENCE_MODE: str = os.getenv("EMOTION_INFERENCE_MODE", "batched")
+    # Sampled frames / face crops per classifier call
+    EMOTION_BATCH_SIZE: int = int(os.getenv("EMOTION_BATCH_SIZE", "16"))
+    # Optional early stop once the running emotion distribution settles
+    EMOTION_EARLY_STOP: bool = os.getenv("EMOTION_EARLY_STOP", "false").lower() in ("1", "true", "yes")
+    # Face frames between convergence checks, and minimum before the first check
+    EMOTION_CONVERGENCE_WINDOW: int = int(os.getenv("EMOTION_CONVERGENCE_WINDOW", "16"))
+    EMOTION_MIN_FRAMES: int = int(os.getenv("EMOTION_MIN_FRAMES", "32"))
+    # Max total variation distance between windows to count as converged
+    EMOTION_CONVERGENCE_TOL: float = float(os.getenv("EMOTION_CONVERGENCE_TOL", "0.02"))
+    # Standard errors the dominant emotion must lead the runner-up by
+    EMOTION_CONFIDENCE_Z: float = float(os.getenv("EMOTION_CONFIDENCE_Z", "3.0"))
+    # Face detection: "mtcnn" (every frame), "cascade" (Haar first, MTCNN on a miss)
+    # or "tracking" (cascade + reuse of the last face box between samples)
+    FACE_DETECTION_STRATEGY: str = os.getenv("FACE_DETECTION_STRATEGY", "tracking")
+    # Samples that may reuse a tracked face box before it is re-verified
+    FACE_TRACK_MAX_REUSE: int = int(os.getenv("FACE_TRACK_MAX_REUSE", "5"))
+    # Frames are downscaled to at most this width before face detection
+    EMOTION_DETECT_MAX_WIDTH: int = int(os.getenv("EMOTION_DETECT_MAX_WIDTH", "640"))
+
+    # Background answer processing (/api/interview/answer with mode=job).
+    # Job state is per process: run a single API worker when clients use mode=job.
+    ANSWER_JOB_WORKERS: int = int(os.getenv("ANSWER_JOB_WORKERS", "4"))
+    ANSWER_JOB_MAX_QUEUED: int = int(os.getenv("ANSWER_JOB_MAX_QUEUED", "200"))
+    # Longest a client may long-poll GET /api/interview/answer/{job_id}
+    ANSWER_JOB_MAX_WAIT_S: float = float(os.getenv("ANSWER_JOB_MAX_WAIT_S", "30"))
+
+    # Rendered report PDFs (LRU-evicted beyond the size limit)
+    PDF_CACHE_DIR: str = os.getenv("PDF_CACHE_DIR", "reports")
+    PDF_CACHE_MAX_BYTES: int = int(os.getenv("PDF_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+    # Processes used for PDF rendering (0 = render in a thread) and per-render timeout
+    PDF_WORKERS: int = int(os.getenv("PDF_WORKERS", "2"))
+    PDF_JOB_TIMEOUT_S: float = float(os.getenv("PDF_JOB_TIMEOUT_S", "60"))
+    # Sessions rendered concurrently by a bulk export
+    EXPORT_CONCURRENCY: int = int(os.getenv("EXPORT_CONCURRENCY", "4"))
+    # Chunk size used when streaming PDFs to clients
+    PDF_STREAM_CHUNK_BYTES: int = int(os.getenv("PDF_STREAM_CHUNK_BYTES", str(64 * 1024)))
+
+    # Transcript / emotion results keyed by upload content hash (LRU-evicted)
+    RESULT_CACHE_DIR: str = os.getenv("RESULT_CACHE_DIR", "result_cache")
+    RESULT_CACHE_MAX_BYTES: int = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    # Read size when streaming uploads to disk
+    UPLOAD_CHUNK_BYTES: int = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+    # Largest accepted upload per file; bigger request bodies get 413
+    MAX_ANSWER_UPLOAD_BYTES: int = int(os.getenv("MAX_ANSWER_UPLOAD_BYTES", str(200 * 1024 * 1024)))
+    MAX_RESUME_UPLOAD_BYTES: int = int(os.getenv("MAX_RESUME_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+    # Resumable answer uploads untouched for this long are deleted
+    RESUMABLE_UPLOAD_TTL_S: float = float(os.getenv("RESUMABLE_UPLOAD_TTL_S", str(24 * 3600)))
+
+    # Session storage: "sqlite" (WAL database) or "json" (sessions/{id}.json files).
+    # With "sqlite", sessions/{id}.json files not yet in the database are imported at startup.
+    SESSION_BACKEND: str = os.getenv("SESSION_BACKEND", "sqlite")
+    SESSION_DB_PATH: str = os.getenv("SESSION_DB_PATH", os.path.join("sessions", "sessions.db"))
+    # Listing/search index for /api/sessions (kept alongside the sessions by default)
+    SESSION_INDEX_PATH: str = os.getenv("SESSION_INDEX_PATH", os.path.join("sessions", "sessions.db"))
+    # Memory-mapped per role/seniority score columns for cohort percentiles
+    COHORT_DIR: str = os.getenv("COHORT_DIR", "cohorts")
+    # File backend: fsync each answer-log append ("always") or leave it to the OS ("never")
+    SESSION_LOG_FSYNC: str = os.getenv("SESSION_LOG_FSYNC", "always")
+    # Answer logs larger than this are folded into the session snapshot
+    SESSION_LOG_COMPACT_BYTES: int = int(os.getenv("SESSION_LOG_COMPACT_BYTES", str(1024 * 1024)))
+    # In-memory LRU of parsed sessions (approximate serialised bytes; 0 = disabled)
+    SESSION_CACHE_MAX_BYTES: int = int(os.getenv("SESSION_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
 
 # 👇 This is what `from app.core.config import settings` will import
 settings = Settings()
@@ -1,11 +1,67 @@
 # backend/app/main.py
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+
+from app.api.routes import resume, interview, report, sessions
+from app.core.config import settings
+from app.services import llm_client, session_store
+from app.services.answer_jobs import answer_jobs
+from app.services.detector_pool import detector_pool
+from app.services.pdf_cache import pdf_cache
+from app.services.result_cache import result_cache
+from app.services.executors import pdf_pool, video_pool, video_analysis_ready
+from app.services.uploads import MULTIPART_OVERHEAD_BYTES, UploadLimitMiddleware
+
+
+async def _warm_detectors():
+    try:
+        if video_pool.enabled:
+            await video_pool.warm_up()
+        else:
+            await asyncio.to_thread(detector_pool.warm_up)
+    except Exception as e:
+        print("Detector warm-up failed:", e)
 
-from app.api.routes import resume, interview, report
 
-app = FastAPI(title="Interview AI Backend")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    imported = await asyncio.to_thread(session_store.import_json_sessions)
+    if imported:
+        print(f"Imported {imported} JSON session(s) into the session database")
+    indexed = await asyncio.to_thread(session_store.backfill_index)
+    if indexed:
+        print(f"Indexed {indexed} session(s) missing from the session index")
+    video_pool.start()
+    pdf_pool.start()
+    await answer_jobs.start()
+    # Load the FER/MTCNN weights in the background so startup is not blocked;
+    # /ready reports when they are available.
+    warm_task = asyncio.create_task(_warm_detectors())
+    yield
+    warm_task.cancel()
+    await answer_jobs.stop()
+    await asyncio.to_thread(video_pool.shutdown)
+    await asyncio.to_thread(pdf_pool.shutdown)
+
+
+app = FastAPI(title="Interview AI Backend", lifespan=lifespan)
+
+# 👇 Refuse oversize uploads before their bodies are parsed
+# (added before CORS so the 413 still carries CORS headers)
+app.add_middleware(
+    UploadLimitMiddleware,
+    limits={
+        "/api/interview/answer": settings.MAX_ANSWER_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+        "/api/resume/upload": settings.MAX_RESUME_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES,
+        # Resumable upload chunks are raw bodies; the total is checked per upload
+        "/api/interview/uploads": settings.MAX_ANSWER_UPLOAD_BYTES,
+    },
+)
 
 # 👇 Allowed frontend origins
 origins = [
@@ -29,8 +85,35 @@ app.add_middleware(
 app.include_router(resume.router, prefix="/api/resume", tags=["resume"])
 app.include_router(interview.router, prefix="/api/interview", tags=["interview"])
 app.include_router(report.router, prefix="/api/report", tags=["report"])
+app.include_router(sessions.router, prefix="/api/sessions", tags=["sessions"])
 
 
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+
+@app.get("/ready")
+async def readiness_check():
+    ready = video_analysis_ready()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "warming",
+            "detector_pool": detector_pool.stats(),
+            "video_pool": video_pool.stats(),
+        },
+    )
+
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "llm": llm_client.stats(),
+        "answer_jobs": answer_jobs.stats(),
+        "video_pool": video_pool.stats(),
+        "pdf_pool": pdf_pool.stats(),
+        "pdf_cache": pdf_cache.stats(),
+        "result_cache": result_cache.stats(),
+        "session_cache": session_store.cache_stats(),
+    }
@@ -0,0 +1,89 @@
+# backend/app/models/db_models.py
+#
+# SQLite schema for the session store (see services/sqlite_store.py).
+#
+# Score/emotion columns are denormalised for filtering and indexing; the
+# `payload` columns keep the original JSON objects so sessions load back
+# exactly as they were written. Anything not covered by a column
+# (status, cached summary/report, ...) lives in sessions.extra.
+
+SCHEMA_VERSION = 2
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS sessions (
+        session_id   TEXT PRIMARY KEY,
+        role         TEXT NOT NULL,
+        seniority    TEXT NOT NULL,
+        created_at   REAL NOT NULL,
+        updated_at   REAL NOT NULL,
+        version      TEXT NOT NULL,
+        answer_count INTEGER NOT NULL DEFAULT 0,
+        aggregates   TEXT,
+        extra        TEXT NOT NULL DEFAULT '{}'
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_sessions_role ON sessions (role)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_seniority ON sessions (seniority)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_created_at ON sessions (created_at)",
+    """
+    CREATE TABLE IF NOT EXISTS answers (
+        answer_id        INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id       TEXT NOT NULL REFERENCES sessions (session_id) ON DELETE CASCADE,
+        position         INTEGER NOT NULL,
+        question_id      TEXT,
+        content_score    REAL,
+        structure_score  REAL,
+        clarity_score    REAL,
+        confidence_score REAL,
+        created_at       REAL NOT NULL,
+        payload          TEXT NOT NULL,
+        UNIQUE (session_id, position)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS expressions (
+        answer_id        INTEGER PRIMARY KEY REFERENCES answers (answer_id) ON DELETE CASCADE,
+        dominant_emotion TEXT,
+        frames_analyzed  INTEGER,
+        face_frames      INTEGER,
+        payload          TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_expressions_dominant ON expressions (dominant_emotion)",
+]
+
+# Statements that bring an existing database up to each schema version
+MIGRATIONS = {
+    # Running aggregates (services/session_aggregates.py); NULL until the
+    # session's next answer for sessions created before version 2
+    2: ["ALTER TABLE sessions ADD COLUMN aggregates TEXT"],
+}
+
+# Listing/search index (services/session_index.py). Lives in the session
+# database for the sqlite backend and in a database of its own for the
+# file backend. Maintained incrementally on create / answer / end.
+INDEX_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS session_index (
+        session_id       TEXT PRIMARY KEY,
+        role             TEXT NOT NULL,
+        seniority        TEXT NOT NULL,
+        role_key         TEXT NOT NULL,
+        seniority_key    TEXT NOT NULL,
+        created_at       REAL NOT NULL,
+        status           TEXT,
+        answer_count     INTEGER NOT NULL DEFAULT 0,
+        content_sum      REAL NOT NULL DEFAULT 0,
+        structure_sum    REAL NOT NULL DEFAULT 0,
+        clarity_sum      REAL NOT NULL DEFAULT 0,
+        confidence_sum   REAL NOT NULL DEFAULT 0,
+        overall_score    REAL
+    )
+    """,
+    # Newest-first listing, optionally narrowed by role and seniority
+    "CREATE INDEX IF NOT EXISTS idx_index_created ON session_index (created_at, session_id)",
+    "CREATE INDEX IF NOT EXISTS idx_index_role ON session_index (role_key, seniority_key, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_index_seniority ON session_index (seniority_key, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_index_score ON session_index (overall_score)",
+]
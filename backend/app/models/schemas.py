@@ -45,3 +45,11 @@ class FinalReport(BaseModel):
     improvements: List[str]
     per_question: List[AnswerEvaluation]
     expressions: ExpressionSummary
+
+
+class BulkExportRequest(BaseModel):
+    # Explicit ids; if empty, every session matching the filters is exported
+    session_ids: List[str] = []
+    role: Optional[str] = None
+    seniority: Optional[str] = None
+    template: str = "detailed"
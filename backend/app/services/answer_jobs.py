@@ -0,0 +1,190 @@
+# backend/app/services/answer_jobs.py
+
+import asyncio
+import itertools
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.services.answer_pipeline import process_answer
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class AnswerJob:
+    """
+    One queued /api/interview/answer request. The video is already on
+    disk when the job is created.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        question_id: str,
+        question_text: str,
+        video_path: str,
+        priority: int,
+        content_hash: Optional[str] = None,
+    ):
+        self.job_id = str(uuid.uuid4())
+        self.session_id = session_id
+        self.question_id = question_id
+        self.question_text = question_text
+        self.video_path = video_path
+        self.priority = priority
+        self.content_hash = content_hash
+
+        self.status = "queued"  # queued → running → done | failed
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.done = asyncio.Event()
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "job_id": self.job_id,
+            "session_id": self.session_id,
+            "question_id": self.question_id,
+            "status": self.status,
+            "priority": self.priority,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.result is not None:
+            data["result"] = self.result
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+class AnswerJobQueue:
+    """
+    Bounded priority queue of answer jobs drained by a fixed number of
+    asyncio workers (lower priority value runs first, FIFO within a
+    priority). Finished jobs are kept for polling up to `max_finished`.
+
+    Jobs live in this process's memory only: mode="job" needs a single
+    API worker process (uvicorn without --workers > 1), or sticky routing
+    so polls reach the worker that accepted the job.
+    """
+
+    def __init__(self, workers: int, max_queued: int, max_finished: int = 1000):
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self.max_finished = max_finished
+
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._tasks: list = []
+        self._jobs: "OrderedDict[str, AnswerJob]" = OrderedDict()
+        self._seq = itertools.count()
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._recent_waits: deque = deque(maxlen=200)
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._queue = asyncio.PriorityQueue(maxsize=self.max_queued)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, job: AnswerJob) -> AnswerJob:
+        if self._queue is None:
+            raise RuntimeError("Answer job queue is not running")
+        try:
+            self._queue.put_nowait((job.priority, next(self._seq), job))
+        except asyncio.QueueFull:
+            raise QueueFullError("Answer job queue is full")
+        self._jobs[job.job_id] = job
+        self._evict_finished()
+        return job
+
+    def get(self, job_id: str) -> Optional[AnswerJob]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: AnswerJob, timeout: float) -> AnswerJob:
+        """Long-poll helper: returns when the job finishes or `timeout` passes."""
+        if timeout > 0 and not job.done.is_set():
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    def _evict_finished(self) -> None:
+        finished = [jid for jid, j in self._jobs.items() if j.done.is_set()]
+        for jid in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[jid]
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, job = await self._queue.get()
+            job.status = "running"
+            job.started_at = time.time()
+            self._recent_waits.append(job.started_at - job.created_at)
+            self._running += 1
+            try:
+                job.result = await process_answer(
+                    session_id=job.session_id,
+                    question_id=job.question_id,
+                    question_text=job.question_text,
+                    video_path=job.video_path,
+                    content_hash=job.content_hash,
+                )
+                job.status = "done"
+                self._completed += 1
+            except asyncio.CancelledError:
+                job.status = "failed"
+                job.error = "cancelled"
+                self._failed += 1
+                task = asyncio.current_task()
+                if task is None or getattr(task, "cancelling", lambda: 1)():
+                    raise  # the worker itself is stopping
+                # Cancelled from below (e.g. a future lost in a pool
+                # recycle): fail this job, keep the worker
+                print("Answer job cancelled:", job.job_id)
+            except Exception as e:
+                print("Answer job failed:", job.job_id, e)
+                job.status = "failed"
+                job.error = str(e)
+                self._failed += 1
+            finally:
+                self._running -= 1
+                job.finished_at = time.time()
+                job.done.set()
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        waits = list(self._recent_waits)
+        queued = [j for j in self._jobs.values() if j.status == "queued"]
+        return {
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queued": self.max_queued,
+            "running": self._running,
+            "completed": self._completed,
+            "failed": self._failed,
+            "oldest_queued_wait_s": round(max((now - j.created_at for j in queued), default=0.0), 3),
+            "avg_wait_s": round(sum(waits) / len(waits), 3) if waits else 0.0,
+            "max_wait_s": round(max(waits), 3) if waits else 0.0,
+        }
+
+
+answer_jobs = AnswerJobQueue(
+    workers=settings.ANSWER_JOB_WORKERS,
+    max_queued=settings.ANSWER_JOB_MAX_QUEUED,
+)
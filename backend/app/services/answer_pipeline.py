@@ -0,0 +1,149 @@
+# backend/app/services/answer_pipeline.py
+
+import asyncio
+import time
+from typing import Any, Awaitable, Dict, Optional, Tuple
+
+from app.services.speech_to_text import TRANSCRIPTION_VERSION, transcribe_video_file
+from app.services.executors import run_video_analysis
+from app.services.face_analysis import analysis_version
+from app.services.result_cache import result_cache
+from app.services.gemini_client import score_answer_gemini
+from app.services.session_store import append_answer
+from app.services.llm_client import record_fallback
+
+
+# ---------------------------------------------------------------------
+#  STAGES (each one falls back instead of failing the whole answer)
+# ---------------------------------------------------------------------
+
+async def _transcribe(video_path: str, content_hash: Optional[str] = None) -> str:
+    cached = result_cache.get_result("transcript", content_hash, TRANSCRIPTION_VERSION)
+    if cached is not None:
+        return cached
+
+    try:
+        transcript = await transcribe_video_file(video_path)
+    except Exception as e:
+        print("Transcription failed:", e)
+        record_fallback("transcription")
+        return ""
+
+    result_cache.put_result("transcript", content_hash, TRANSCRIPTION_VERSION, transcript)
+    return transcript
+
+
+async def _analyze_emotions(video_path: str, content_hash: Optional[str] = None) -> Dict[str, Any]:
+    version = analysis_version()
+    cached = result_cache.get_result("emotion", content_hash, version)
+    if cached is not None:
+        return cached
+
+    try:
+        emotion_result = await run_video_analysis(video_path)
+    except Exception as e:
+        print("Emotion analysis failed:", e)
+        return {
+            "dominant_emotion": "unknown",
+            "emotion_scores": {},
+        }
+
+    result_cache.put_result("emotion", content_hash, version, emotion_result)
+    return emotion_result
+
+
+async def _score(question_text: str, transcript: str) -> Dict[str, Any]:
+    try:
+        return await score_answer_gemini(
+            question=question_text,
+            transcript=transcript
+        )
+    except Exception as e:
+        print("Gemini scoring failed:", e)
+        record_fallback("scoring")
+        return {
+            "content_score": 0,
+            "structure_score": 0,
+            "clarity_score": 0,
+            "confidence_score": 0,
+            "feedback": "AI Scoring failed."
+        }
+
+
+# ---------------------------------------------------------------------
+#  PIPELINE
+# ---------------------------------------------------------------------
+
+async def run_answer_pipeline(video_path: str, question_text: str, content_hash: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Processes one saved answer video.
+
+    Transcription (network-bound) and emotion analysis (CPU-bound, in the
+    video pool) run concurrently; scoring starts as soon as the transcript
+    is ready. With the upload's `content_hash`, transcript and emotion
+    results of an identical earlier upload are reused. Returns transcript,
+    emotion, scores and per-stage timings in seconds.
+    """
+
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    async def timed(stage: str, awaitable: Awaitable[Any]) -> Any:
+        stage_start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            timings[stage] = round(time.perf_counter() - stage_start, 3)
+
+    async def transcribe_then_score() -> Tuple[str, Dict[str, Any]]:
+        transcript = await timed("transcription", _transcribe(video_path, content_hash))
+        ai_score = await timed("scoring", _score(question_text, transcript))
+        return transcript, ai_score
+
+    (transcript, ai_score), emotion_result = await asyncio.gather(
+        transcribe_then_score(),
+        timed("emotion_analysis", _analyze_emotions(video_path, content_hash)),
+    )
+
+    timings["total"] = round(time.perf_counter() - started, 3)
+
+    return {
+        "transcript": transcript,
+        "emotion": emotion_result,
+        "scores": ai_score,
+        "timings": timings,
+    }
+
+
+async def process_answer(
+    session_id: str,
+    question_id: str,
+    question_text: str,
+    video_path: str,
+    content_hash: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Runs the pipeline for a saved video and appends the answer to the
+    session. Returns the /api/interview/answer response body.
+    """
+
+    result = await run_answer_pipeline(video_path, question_text, content_hash)
+    transcript = result["transcript"]
+    emotion_result = result["emotion"]
+    ai_score = result["scores"]
+
+    await asyncio.to_thread(append_answer, session_id, {
+        "question_id": question_id,
+        "question_text": question_text,
+        "transcript": transcript,
+        **ai_score,
+        "expression": emotion_result
+    })
+
+    return {
+        "message": "Answer saved successfully",
+        "transcript": transcript,
+        "emotion": emotion_result,
+        "scores": ai_score,
+        "timings": result["timings"]
+    }
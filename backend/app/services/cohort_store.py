@@ -0,0 +1,286 @@
+# backend/app/services/cohort_store.py
+#
+# Columnar score store for cohort comparisons. One bucket per
+# (role, seniority), each made of
+#   cohorts/{bucket}.f4   float32 rows of COLUMNS, one row per session
+#   cohorts/{bucket}.ids  a generation header, then session ids, one per
+#                         line, in row order
+# The .f4 file is memory-mapped read-only for queries, so percentiles and
+# histograms over a whole cohort are a few vectorised NumPy calls and
+# never touch the sessions themselves. A session's row is written when
+# it gets its first answer and overwritten in place as its averages change.
+
+import os
+import re
+import uuid
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl  # POSIX only; without it locking is per process
+except ImportError:
+    fcntl = None
+
+from app.core.config import settings
+from app.services.session_aggregates import SCORE_FIELDS, session_aggregates
+
+COLUMNS = SCORE_FIELDS + ("overall_score",)
+DTYPE = np.dtype("<f4")
+ROW_BYTES = DTYPE.itemsize * len(COLUMNS)
+PERCENTILES = (10, 25, 50, 75, 90)
+# First line of a .ids file: "#gen <hex>", new on every rebuild
+_HEADER_PREFIX = b"#gen "
+
+
+def _key(value: Optional[str]) -> str:
+    return (value or "").strip().lower()
+
+
+def bucket_name(role: Optional[str], seniority: Optional[str]) -> str:
+    """Readable, filesystem-safe and collision-free name for a cohort."""
+    role_key, seniority_key = _key(role), _key(seniority)
+    slug = re.sub(r"[^a-z0-9]+", "-", f"{role_key}--{seniority_key}").strip("-")[:60]
+    digest = hashlib.sha1(f"{role_key}\0{seniority_key}".encode("utf-8")).hexdigest()[:8]
+    return f"{slug}-{digest}"
+
+
+def session_row(session_data: Dict[str, Any]) -> Optional[np.ndarray]:
+    """The session's average scores as a store row (None before any answer)."""
+    aggregates = session_aggregates(session_data)
+    n = aggregates["answers"]
+    if not n:
+        return None
+    averages = [aggregates["score_sums"][field] / n for field in SCORE_FIELDS]
+    return np.array(averages + [sum(averages) / len(averages)], dtype=DTYPE)
+
+
+class _Bucket:
+    """Writer-side state: the session id → row mapping, read incrementally."""
+
+    def __init__(self, directory: str, name: str):
+        self.data_path = os.path.join(directory, f"{name}.f4")
+        self.ids_path = os.path.join(directory, f"{name}.ids")
+        self.rows: Dict[str, int] = {}
+        self.generation: Optional[bytes] = None  # header of the parsed .ids file
+        self.parsed_bytes = 0  # bytes of the .ids file already parsed
+        self.lock = threading.Lock()
+
+    def refresh(self) -> None:
+        # Other worker processes append too: parse only what is new. A
+        # rebuild replaces the files with a new generation header, and
+        # the mapping is then re-read from the start.
+        try:
+            with open(self.ids_path, "rb") as f:
+                first = f.readline()
+                generation = first if first.startswith(_HEADER_PREFIX) else b""
+                if generation != self.generation:
+                    self.rows.clear()
+                    self.generation = generation
+                    self.parsed_bytes = len(generation)
+                f.seek(self.parsed_bytes)
+                tail = f.read()
+        except FileNotFoundError:
+            self.rows.clear()
+            self.generation = None
+            self.parsed_bytes = 0
+            return
+        complete = tail[:tail.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            self.rows.setdefault(line.decode("utf-8"), len(self.rows))
+        self.parsed_bytes += len(complete)
+
+
+def _new_header() -> bytes:
+    return _HEADER_PREFIX + uuid.uuid4().hex.encode("ascii") + b"\n"
+
+
+@contextmanager
+def _locked_ids(path: str) -> Iterator[BinaryIO]:
+    """
+    The bucket's .ids file opened for appending and exclusively locked.
+    Re-opened if a rebuild replaced it while we waited for the lock, so
+    the lock and the appends always hit the current file.
+    """
+    while True:
+        f = open(path, "ab")
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            current = os.stat(path).st_ino == os.fstat(f.fileno()).st_ino
+        except FileNotFoundError:
+            current = False
+        if current:
+            break
+        f.close()
+    try:
+        yield f
+    finally:
+        f.close()
+
+
+class CohortStore:
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._buckets: Dict[str, _Bucket] = {}
+        self._buckets_guard = threading.Lock()
+
+    def _bucket(self, name: str) -> _Bucket:
+        with self._buckets_guard:
+            bucket = self._buckets.get(name)
+            if bucket is None:
+                bucket = self._buckets[name] = _Bucket(self.directory, name)
+            return bucket
+
+    # ------------------------------------------------------------------
+    #  WRITES
+    # ------------------------------------------------------------------
+
+    def record(self, session_data: Dict[str, Any]) -> None:
+        """Writes (or overwrites) the session's row in its cohort."""
+        row = session_row(session_data)
+        if row is None:
+            return
+        bucket = self._bucket(bucket_name(session_data.get("role"), session_data.get("seniority")))
+        session_id = session_data["session_id"]
+
+        with bucket.lock, _locked_ids(bucket.ids_path) as ids:
+            if ids.tell() == 0:
+                ids.write(_new_header())
+                ids.flush()
+            bucket.refresh()
+
+            fd = os.open(bucket.data_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                index = bucket.rows.get(session_id)
+                if index is not None:
+                    os.pwrite(fd, row.tobytes(), index * ROW_BYTES)
+                    return
+                # New session: row first, then its id. A crash in between
+                # leaves a row past the last id, which queries ignore and
+                # the next new session overwrites.
+                index = len(bucket.rows)
+                os.pwrite(fd, row.tobytes(), index * ROW_BYTES)
+            finally:
+                os.close(fd)
+
+            ids.write(f"{session_id}\n".encode("utf-8"))
+            ids.flush()
+            bucket.rows[session_id] = index
+            bucket.parsed_bytes = ids.tell()
+
+    def rebuild(self, sessions: Iterable[Dict[str, Any]]) -> int:
+        """
+        Rewrites every bucket from scratch (python -m app.cli reindex).
+        Files are replaced atomically under each bucket's lock with a new
+        generation header, so running servers re-read the mapping instead
+        of writing at stale row offsets.
+        """
+        grouped: Dict[str, Tuple[List[str], List[np.ndarray]]] = {}
+        for session_data in sessions:
+            row = session_row(session_data)
+            if row is None:
+                continue
+            name = bucket_name(session_data.get("role"), session_data.get("seniority"))
+            ids, rows = grouped.setdefault(name, ([], []))
+            ids.append(session_data["session_id"])
+            rows.append(row)
+
+        existing = {name[:-len(".ids")] for name in os.listdir(self.directory) if name.endswith(".ids")}
+        for name in existing | set(grouped):
+            bucket = self._bucket(name)
+            with bucket.lock, _locked_ids(bucket.ids_path):
+                if name not in grouped:
+                    for path in (bucket.data_path, bucket.ids_path):
+                        try:
+                            os.remove(path)
+                        except FileNotFoundError:
+                            pass
+                    continue
+
+                ids, rows = grouped[name]
+                np.stack(rows).astype(DTYPE).tofile(f"{bucket.data_path}.tmp")
+                with open(f"{bucket.ids_path}.tmp", "wb") as f:
+                    f.write(_new_header())
+                    f.writelines(f"{session_id}\n".encode("utf-8") for session_id in ids)
+                # Data first: until the new .ids lands, readers size the
+                # matrix from the old (shorter or equal) id list
+                os.replace(f"{bucket.data_path}.tmp", bucket.data_path)
+                os.replace(f"{bucket.ids_path}.tmp", bucket.ids_path)
+        return sum(len(ids) for ids, _ in grouped.values())
+
+    # ------------------------------------------------------------------
+    #  QUERIES
+    # ------------------------------------------------------------------
+
+    def scores(self, role: Optional[str], seniority: Optional[str]) -> np.ndarray:
+        """Read-only (sessions × COLUMNS) view of a cohort, memory-mapped."""
+        bucket = self._bucket(bucket_name(role, seniority))
+        with bucket.lock:
+            bucket.refresh()
+            # Sized by the id list: a row written just before a crash (or
+            # before its id) has no id yet and is not part of the cohort
+            rows = len(bucket.rows)
+        try:
+            rows = min(rows, os.path.getsize(bucket.data_path) // ROW_BYTES)
+        except FileNotFoundError:
+            rows = 0
+        if rows == 0:
+            return np.empty((0, len(COLUMNS)), dtype=DTYPE)
+        return np.memmap(bucket.data_path, dtype=DTYPE, mode="r", shape=(rows, len(COLUMNS)))
+
+    def summary(self, role: Optional[str], seniority: Optional[str], bins: int = 10) -> Dict[str, Any]:
+        """Per-score mean, percentiles and a 0–10 histogram for a cohort."""
+        scores = np.asarray(self.scores(role, seniority), dtype=np.float64)
+        n = scores.shape[0]
+        edges = np.linspace(0.0, 10.0, bins + 1)
+
+        result: Dict[str, Any] = {"role": role, "seniority": seniority, "sessions": n, "bin_edges": edges.round(3).tolist()}
+        if n == 0:
+            result["scores"] = {}
+            return result
+
+        means = scores.mean(axis=0)
+        stds = scores.std(axis=0)
+        quantiles = np.percentile(scores, PERCENTILES, axis=0)  # (len(PERCENTILES), columns)
+        clipped = np.clip(scores, 0.0, 10.0)
+
+        result["scores"] = {
+            column: {
+                "mean": round(float(means[i]), 2),
+                "std": round(float(stds[i]), 2),
+                "percentiles": {f"p{p}": round(float(quantiles[j, i]), 2) for j, p in enumerate(PERCENTILES)},
+                "histogram": np.histogram(clipped[:, i], bins=edges)[0].tolist(),
+            }
+            for i, column in enumerate(COLUMNS)
+        }
+        return result
+
+    def percentile_ranks(self, session_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Where the session's averages rank within its cohort (0–100)."""
+        role, seniority = session_data.get("role"), session_data.get("seniority")
+        row = session_row(session_data)
+        scores = self.scores(role, seniority)
+        n = scores.shape[0]
+
+        result: Dict[str, Any] = {"role": role, "seniority": seniority, "cohort_size": n, "scores": {}}
+        if row is None or n == 0:
+            return result
+
+        # Mid-rank: ties count half, so a cohort of identical scores ranks 50
+        below = (scores < row).sum(axis=0)
+        equal = (scores == row).sum(axis=0)
+        ranks = (below + 0.5 * equal) / n * 100.0
+
+        result["scores"] = {
+            column: {"score": round(float(row[i]), 2), "percentile": round(float(ranks[i]), 1)}
+            for i, column in enumerate(COLUMNS)
+        }
+        return result
+
+
+cohort_store = CohortStore(settings.COHORT_DIR)
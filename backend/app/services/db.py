@@ -0,0 +1,36 @@
+# backend/app/services/db.py
+#
+# SQLite helpers shared by the session store and the session index.
+
+import sqlite3
+
+
+def connect(path: str, busy_timeout_s: float = 30.0) -> sqlite3.Connection:
+    """
+    Opens a WAL-mode connection in autocommit mode; write transactions are
+    opened explicitly with WriteTransaction.
+    """
+    conn = sqlite3.connect(path, timeout=busy_timeout_s, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+class WriteTransaction:
+    """
+    BEGIN IMMEDIATE ... COMMIT/ROLLBACK. Taking the write lock up front
+    means a read-then-write (e.g. append_answer) cannot be interleaved
+    with another writer.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
@@ -0,0 +1,80 @@
+# backend/app/services/detector_pool.py
+
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from fer import FER
+
+from app.core.config import settings
+
+
+class DetectorPool:
+    """
+    Bounded pool of warm FER detectors.
+
+    Building FER(mtcnn=True) loads the MTCNN and emotion CNN weights, which
+    takes seconds. The pool builds them once (at app startup) and lends them
+    out to concurrent analyses; callers block until a detector is free.
+    """
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._free: "queue.Queue[FER]" = queue.Queue(maxsize=self.size)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._ready = threading.Event()
+
+    def _build(self) -> FER:
+        detector = FER(mtcnn=True)
+        self._created += 1
+        return detector
+
+    def warm_up(self, count: Optional[int] = None) -> None:
+        """
+        Create detectors up front so the first request does not pay
+        the model load. Builds the whole pool unless `count` is given.
+        Safe to call more than once.
+        """
+        target = self.size if count is None else min(self.size, count)
+        with self._lock:
+            while self._created < target:
+                self._free.put(self._build())
+        self._ready.set()
+
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[FER]:
+        """
+        Borrow a detector for the duration of the `with` block.
+        Lazily builds detectors if the pool was never warmed.
+        """
+        detector = None
+        try:
+            detector = self._free.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if self._created < self.size:
+                    detector = self._build()
+            if detector is None:
+                detector = self._free.get(timeout=timeout)
+
+        try:
+            yield detector
+        finally:
+            self._free.put(detector)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "created": self._created,
+            "available": self._free.qsize(),
+            "ready": self.is_ready(),
+        }
+
+
+# Process-wide pool, warmed from the app lifespan
+detector_pool = DetectorPool(settings.FER_POOL_SIZE)
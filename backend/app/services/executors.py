@@ -0,0 +1,64 @@
+# backend/app/services/executors.py
+
+import asyncio
+from typing import Any, Callable
+
+from app.core.config import settings
+from app.services.detector_pool import detector_pool
+from app.services.face_analysis import analyze_video_emotions, warm_up_worker
+from app.services.process_pool import ManagedProcessPool
+
+
+# ---------------------------------------------------------------------
+#  VIDEO ANALYSIS
+# ---------------------------------------------------------------------
+
+video_pool = ManagedProcessPool(
+    "video",
+    settings.VIDEO_WORKERS,
+    initializer=warm_up_worker,
+    default_timeout=settings.VIDEO_JOB_TIMEOUT_S,
+)
+
+
+async def run_video_analysis(video_path: str) -> dict:
+    """
+    Run analyze_video_emotions without blocking the event loop.
+    Uses the process pool when VIDEO_WORKERS > 0, otherwise a thread
+    backed by the in-process detector pool.
+    """
+    if video_pool.enabled:
+        return await video_pool.run(analyze_video_emotions, video_path)
+
+    return await asyncio.wait_for(
+        asyncio.to_thread(analyze_video_emotions, video_path),
+        settings.VIDEO_JOB_TIMEOUT_S,
+    )
+
+
+def video_analysis_ready() -> bool:
+    if video_pool.enabled:
+        return video_pool.is_ready()
+    return detector_pool.is_ready()
+
+
+# ---------------------------------------------------------------------
+#  PDF RENDERING
+# ---------------------------------------------------------------------
+
+pdf_pool = ManagedProcessPool(
+    "pdf",
+    settings.PDF_WORKERS,
+    default_timeout=settings.PDF_JOB_TIMEOUT_S,
+)
+
+
+async def run_pdf_render(fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a reportlab render function off the event loop: in the PDF
+    process pool when PDF_WORKERS > 0, otherwise in a thread.
+    """
+    if pdf_pool.enabled:
+        return await pdf_pool.run(fn, *args)
+
+    return await asyncio.wait_for(asyncio.to_thread(fn, *args), settings.PDF_JOB_TIMEOUT_S)
@@ -1,5 +1,228 @@
+import os
+import json
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
 import cv2
-from fer import FER
+import numpy as np
+
+from app.core.config import settings
+from app.services.detector_pool import detector_pool
+from app.services.face_detection import FaceLocator
+from app.services.frame_sampler import FrameSampler, probe_duration_ms
+
+
+# Label order of FER's emotion classifier output
+EMOTION_LABELS = ("angry", "disgust", "fear", "happy", "sad", "surprise", "neutral")
+
+# FER expands each face box by this many pixels before classifying
+FACE_OFFSETS = (10, 10)
+
+
+def _empty_result() -> dict:
+    return {
+        "dominant_emotion": "unknown",
+        "emotion_scores": {},
+    }
+
+
+def _emotion_model(detector) -> Optional[Tuple[object, Tuple[int, int]]]:
+    """
+    FER keeps its Keras classifier and input size in name-mangled
+    attributes; reach in so we can call the model once per batch.
+    None if this FER version stores them differently.
+    """
+    model = getattr(detector, "_FER__emotion_classifier", None)
+    target_size = getattr(detector, "_FER__emotion_target_size", None)
+    if model is None or not hasattr(model, "predict_on_batch") or target_size is None:
+        return None
+    return model, tuple(target_size)
+
+
+def _face_box(x: int, y: int, w: int, h: int, shape) -> Tuple[int, int, int, int]:
+    """
+    Square the detected box and apply FER's offsets, clamped to the frame.
+    Returns (x1, y1, x2, y2).
+    """
+    side = max(w, h)
+    cx, cy = x + w // 2, y + h // 2
+    x1 = cx - side // 2 - FACE_OFFSETS[0]
+    y1 = cy - side // 2 - FACE_OFFSETS[1]
+    x2 = cx + side // 2 + FACE_OFFSETS[0]
+    y2 = cy + side // 2 + FACE_OFFSETS[1]
+
+    height, width = shape[:2]
+    return max(0, x1), max(0, y1), min(width, x2), min(height, y2)
+
+
+def _detect_step(width: int) -> int:
+    # Integer downscale factor that brings the frame under the detection width
+    return max(1, -(-width // settings.EMOTION_DETECT_MAX_WIDTH))
+
+
+def _classify_batch(detector, locator: FaceLocator, frames: List[np.ndarray]) -> List[Optional[np.ndarray]]:
+    """
+    Batched inference for a list of same-sized BGR frames.
+
+    Faces are located frame by frame; their crops are normalised together
+    and classified with a single model call. Returns one probability
+    vector per frame (None where no face was found). The caller checks
+    _emotion_model(detector) first.
+    """
+    model, target_size = _emotion_model(detector)
+
+    # One uint8 grayscale buffer reused across the batch
+    gray = np.empty(frames[0].shape[:2], dtype=np.uint8)
+    step = _detect_step(frames[0].shape[1])
+
+    crops: List[np.ndarray] = []
+    owners: List[int] = []
+
+    for i, frame in enumerate(frames):
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+
+        # Integer-factor downscale for the detectors
+        small = np.ascontiguousarray(frame[::step, ::step])
+        box = locator.locate(small, np.ascontiguousarray(gray[::step, ::step]))
+        if box is None:
+            continue
+
+        x, y, w, h = box
+        x1, y1, x2, y2 = _face_box(x * step, y * step, w * step, h * step, gray.shape)
+        face = gray[y1:y2, x1:x2]
+        if face.size == 0:
+            continue
+
+        crops.append(cv2.resize(face, (target_size[1], target_size[0])))
+        owners.append(i)
+
+    results: List[Optional[np.ndarray]] = [None] * len(frames)
+    if not crops:
+        return results
+
+    # Same preprocessing as FER: scale to [-1, 1], add channel axis
+    inputs = (np.stack(crops).astype(np.float32) / 255.0 - 0.5) * 2.0
+    inputs = inputs[..., np.newaxis]
+
+    batch_size = settings.EMOTION_BATCH_SIZE
+    predictions = np.concatenate(
+        [
+            np.asarray(model.predict_on_batch(inputs[start:start + batch_size]))
+            for start in range(0, len(inputs), batch_size)
+        ]
+    )
+
+    for owner, probs in zip(owners, predictions):
+        results[owner] = probs
+
+    return results
+
+
+def _classify_single(detector, locator: FaceLocator, frame: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Per-frame path: locate the face, then let FER classify it.
+    """
+    step = _detect_step(frame.shape[1])
+    small = np.ascontiguousarray(frame[::step, ::step])
+    box = locator.locate(small, cv2.cvtColor(small, cv2.COLOR_BGR2GRAY))
+    if box is None:
+        return None
+
+    x, y, w, h = box
+    results = detector.detect_emotions(frame, face_rectangles=[(x * step, y * step, w * step, h * step)])
+    if not results:
+        return None
+    emotions = results[0]["emotions"]
+    return np.array([emotions.get(label, 0.0) for label in EMOTION_LABELS], dtype=np.float32)
+
+
+class _EmotionAccumulator:
+    """
+    Running sum of per-frame emotion probabilities.
+
+    With `early_stop` it also checks every `window` face frames (after
+    `min_frames`): it stops once the mean distribution of the last
+    `window` frames is within `tolerance` total variation distance of the
+    window before it ("converged"), or once the dominant emotion leads
+    the runner-up by more than `z` standard errors ("confident").
+    Windows are compared rather than running means, which move by only
+    ~1/n per frame whatever the video shows.
+    """
+
+    def __init__(self, early_stop: bool, window: int, tolerance: float, min_frames: int, z: float):
+        self.early_stop = early_stop
+        self.window = max(1, window)
+        self.tolerance = tolerance
+        self.min_frames = min_frames
+        self.z = z
+
+        self.total = np.zeros(len(EMOTION_LABELS), dtype=np.float64)
+        self.samples: List[np.ndarray] = []
+        self.stop_reason: Optional[str] = None
+        self._checked_at = 0
+
+    @property
+    def face_frames(self) -> int:
+        return len(self.samples)
+
+    def add(self, probs: np.ndarray) -> None:
+        self.total += probs
+        self.samples.append(probs)
+
+    @staticmethod
+    def _distribution(totals: np.ndarray) -> np.ndarray:
+        return totals / max(totals.sum(), 1e-12)
+
+    def should_stop(self) -> bool:
+        n = len(self.samples)
+        if not self.early_stop or n < self.min_frames or n - self._checked_at < self.window:
+            return False
+        self._checked_at = n
+
+        if n >= 2 * self.window:
+            recent = np.stack(self.samples[-2 * self.window:])
+            last = self._distribution(recent[self.window:].sum(axis=0))
+            before = self._distribution(recent[:self.window].sum(axis=0))
+            if 0.5 * np.abs(last - before).sum() < self.tolerance:
+                self.stop_reason = "converged"
+                return True
+
+        distribution = self._distribution(self.total)
+        first, second = np.argsort(distribution)[::-1][:2]
+        lead = np.stack(self.samples)[:, [first, second]] @ np.array([1.0, -1.0])
+        stderr = lead.std(ddof=1) / np.sqrt(n)
+        if lead.mean() - self.z * stderr > 0:
+            self.stop_reason = "confident"
+            return True
+
+        return False
+
+
+def analysis_version() -> str:
+    """
+    Short hash of every setting that can change analyze_video_emotions'
+    output for the same video; part of the result cache key.
+    """
+    config = {
+        name: getattr(settings, name)
+        for name in (
+            "EMOTION_SAMPLE_FPS",
+            "EMOTION_MAX_FRAMES",
+            "EMOTION_INFERENCE_MODE",
+            "EMOTION_BATCH_SIZE",
+            "EMOTION_EARLY_STOP",
+            "EMOTION_CONVERGENCE_WINDOW",
+            "EMOTION_MIN_FRAMES",
+            "EMOTION_CONVERGENCE_TOL",
+            "EMOTION_CONFIDENCE_Z",
+            "FACE_DETECTION_STRATEGY",
+            "FACE_TRACK_MAX_REUSE",
+            "EMOTION_DETECT_MAX_WIDTH",
+        )
+    }
+    config["labels"] = EMOTION_LABELS
+    payload = json.dumps(config, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
 
 
 def analyze_video_emotions(video_path: str) -> dict:
@@ -8,56 +231,109 @@ def analyze_video_emotions(video_path: str) -> dict:
     It scans frames in the video and averages detected emotions.
     """
 
-    detector = FER(mtcnn=True)
     cap = cv2.VideoCapture(video_path)
 
     if not cap.isOpened():
-        return {
-            "dominant_emotion": "unknown",
-            "emotion_scores": {},
-        }
-
-    emotion_aggregate = {}
-    frame_count = 0
-
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        frame_count += 1
-        # Sample every 5th frame to reduce compute
-        if frame_count % 5 != 0:
-            continue
+        return _empty_result()
 
-        results = detector.detect_emotions(frame)
-        if not results:
-            continue
+    batched = settings.EMOTION_INFERENCE_MODE == "batched"
+    pending: List[np.ndarray] = []
+
+    duration_ms = 0.0
+    if not (cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0) > 0:
+        duration_ms = probe_duration_ms(video_path)
+
+    sampler = FrameSampler(
+        cap,
+        sample_fps=settings.EMOTION_SAMPLE_FPS,
+        max_frames=settings.EMOTION_MAX_FRAMES,
+        duration_ms=duration_ms,
+    )
+    accumulator = _EmotionAccumulator(
+        early_stop=settings.EMOTION_EARLY_STOP,
+        window=settings.EMOTION_CONVERGENCE_WINDOW,
+        tolerance=settings.EMOTION_CONVERGENCE_TOL,
+        min_frames=settings.EMOTION_MIN_FRAMES,
+        z=settings.EMOTION_CONFIDENCE_Z,
+    )
+
+    # Borrow a warm detector instead of reloading the models per call
+    with detector_pool.acquire() as detector:
+        if batched and _emotion_model(detector) is None:
+            print("FER classifier not reachable for batching; using per-frame inference")
+            batched = False
+
+        locator = FaceLocator(
+            detector,
+            strategy=settings.FACE_DETECTION_STRATEGY,
+            max_reuse=settings.FACE_TRACK_MAX_REUSE,
+        )
+
+        def flush():
+            for probs in _classify_batch(detector, locator, pending):
+                if probs is not None:
+                    accumulator.add(probs)
+            pending.clear()
+
+        for frame in sampler:
+            if not batched:
+                probs = _classify_single(detector, locator, frame)
+                if probs is not None:
+                    accumulator.add(probs)
+                if accumulator.should_stop():
+                    break
+                continue
 
-        emotions = results[0]["emotions"]
-        for emo, score in emotions.items():
-            emotion_aggregate[emo] = emotion_aggregate.get(emo, 0.0) + score
+            # np.stack needs equal shapes; flush if the stream changes size
+            if pending and frame.shape != pending[0].shape:
+                flush()
+
+            pending.append(frame)
+            if len(pending) >= settings.EMOTION_BATCH_SIZE:
+                flush()
+                if accumulator.should_stop():
+                    break
+
+        if pending:
+            flush()
 
     cap.release()
 
-    if not emotion_aggregate:
-        return {
-            "dominant_emotion": "unknown",
-            "emotion_scores": {},
-        }
+    if accumulator.stop_reason:
+        stop_reason = accumulator.stop_reason
+    elif sampler.budget_exhausted:
+        stop_reason = "frame_budget"
+    else:
+        stop_reason = "end_of_video"
+
+    sampling = {
+        "frames_analyzed": sampler.frames_sampled,
+        "face_frames": accumulator.face_frames,
+        "stop_reason": stop_reason,
+        "face_detection": locator.stats(),
+    }
 
     # Normalize by total frames counted
-    total = sum(emotion_aggregate.values())
+    total = float(accumulator.total.sum())
     if total == 0:
-        return {
-            "dominant_emotion": "unknown",
-            "emotion_scores": {},
-        }
+        return {**_empty_result(), **sampling}
 
-    normalized = {k: v / total for k, v in emotion_aggregate.items()}
+    normalized: Dict[str, float] = {
+        label: float(v / total) for label, v in zip(EMOTION_LABELS, accumulator.total)
+    }
     dominant = max(normalized, key=normalized.get)
 
     return {
         "dominant_emotion": dominant,
         "emotion_scores": normalized,
+        **sampling,
     }
+
+
+def warm_up_worker() -> int:
+    """
+    Process-pool initializer / warm-up job: each analysis worker only runs
+    one video at a time, so it keeps a single warm detector.
+    """
+    detector_pool.warm_up(count=1)
+    return os.getpid()
@@ -0,0 +1,117 @@
+# backend/app/services/face_detection.py
+
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+Box = Tuple[int, int, int, int]  # x, y, w, h
+
+STRATEGIES = ("mtcnn", "cascade", "tracking")
+TIERS = ("tracked", "haar", "mtcnn", "miss")
+
+_haar: Optional["cv2.CascadeClassifier"] = None
+
+
+def _haar_detector() -> "cv2.CascadeClassifier":
+    global _haar
+    if _haar is None:
+        _haar = cv2.CascadeClassifier(
+            cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+        )
+    return _haar
+
+
+def _largest(faces) -> Optional[Box]:
+    if faces is None or len(faces) == 0:
+        return None
+    x, y, w, h = max(faces, key=lambda f: f[2] * f[3])
+    return int(x), int(y), int(w), int(h)
+
+
+class FaceLocator:
+    """
+    Finds the candidate's face in sampled frames, cheapest method first.
+
+    Strategies:
+      - "mtcnn":    FER's MTCNN on every frame (previous behaviour)
+      - "cascade":  Haar cascade on the downscaled frame, MTCNN only on a miss
+      - "tracking": like "cascade", but reuses the last face box for up to
+                    `max_reuse` samples, then re-verifies it with a Haar pass
+                    restricted to the area around it
+
+    Boxes are in the coordinates of the (downscaled) frame passed in.
+    One locator per video; it keeps the tracking state and tier counters.
+    """
+
+    def __init__(self, detector, strategy: str = "tracking", max_reuse: int = 5, roi_margin: float = 0.5):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown face detection strategy: {strategy}")
+
+        self.detector = detector
+        self.strategy = strategy
+        self.max_reuse = max_reuse
+        self.roi_margin = roi_margin
+
+        self._last: Optional[Box] = None
+        self._reused = 0
+        self.counts: Dict[str, int] = {tier: 0 for tier in TIERS}
+
+    def _haar(self, gray: np.ndarray) -> Optional[Box]:
+        min_side = max(24, min(gray.shape[:2]) // 8)
+        faces = _haar_detector().detectMultiScale(
+            gray, scaleFactor=1.15, minNeighbors=5, minSize=(min_side, min_side)
+        )
+        return _largest(faces)
+
+    def _haar_near_last(self, gray: np.ndarray) -> Optional[Box]:
+        x, y, w, h = self._last
+        mx, my = int(w * self.roi_margin), int(h * self.roi_margin)
+        x1, y1 = max(0, x - mx), max(0, y - my)
+        x2, y2 = min(gray.shape[1], x + w + mx), min(gray.shape[0], y + h + my)
+
+        face = self._haar(gray[y1:y2, x1:x2])
+        if face is None:
+            return None
+        fx, fy, fw, fh = face
+        return fx + x1, fy + y1, fw, fh
+
+    def _mtcnn(self, frame_bgr: np.ndarray) -> Optional[Box]:
+        return _largest(self.detector.find_faces(frame_bgr, bgr=True))
+
+    def _hit(self, tier: str, box: Optional[Box]) -> Optional[Box]:
+        self.counts[tier if box is not None else "miss"] += 1
+        self._last = box
+        self._reused = 0
+        return box
+
+    def locate(self, frame_bgr: np.ndarray, gray: np.ndarray) -> Optional[Box]:
+        if self.strategy == "mtcnn":
+            return self._hit("mtcnn", self._mtcnn(frame_bgr))
+
+        if self.strategy == "tracking" and self._last is not None:
+            if self._reused < self.max_reuse:
+                self._reused += 1
+                self.counts["tracked"] += 1
+                return self._last
+
+            box = self._haar_near_last(gray)
+            if box is not None:
+                return self._hit("haar", box)
+
+        box = self._haar(gray)
+        if box is not None:
+            return self._hit("haar", box)
+
+        return self._hit("mtcnn", self._mtcnn(frame_bgr))
+
+    def stats(self) -> dict:
+        total = sum(self.counts.values())
+        return {
+            "strategy": self.strategy,
+            "counts": dict(self.counts),
+            "hit_rates": {
+                tier: round(n / total, 4) if total else 0.0
+                for tier, n in self.counts.items()
+            },
+        }
@@ -0,0 +1,138 @@
+# backend/app/services/file_cache.py
+
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, BinaryIO, Dict, Optional
+
+
+class FileCache:
+    """
+    On-disk cache of files with size-bounded LRU eviction, one file per
+    key. Recency is tracked in memory and mirrored to file mtimes, so the
+    order survives a restart.
+    """
+
+    suffix = ".bin"
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key → size
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    def _load(self) -> None:
+        found = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.suffix):
+                continue
+            st = os.stat(os.path.join(self.directory, name))
+            found.append((st.st_mtime, name[:-len(self.suffix)], st.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._bytes += size
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def get(self, key: str) -> Optional[str]:
+        path = self.path_for(key)
+        with self._lock:
+            if key in self._entries and os.path.exists(path):
+                self._entries.move_to_end(key)
+                self.hits += 1
+            elif key not in self._entries and os.path.exists(path):
+                # Written by another worker process
+                size = os.path.getsize(path)
+                self._entries[key] = size
+                self._bytes += size
+                self.hits += 1
+            else:
+                self.misses += 1
+                return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        """
+        Like get(), but returns the file opened for reading. The file is
+        opened under the cache lock, so a concurrent eviction in this
+        process cannot remove it first; once open, the data stays readable
+        even if it is evicted (by any process) while being served.
+        """
+        path = self.path_for(key)
+        with self._lock:
+            try:
+                f = open(path, "rb")
+            except FileNotFoundError:
+                self.misses += 1
+                self._bytes -= self._entries.pop(key, 0)
+                return None
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            else:
+                # Written by another worker process
+                size = os.fstat(f.fileno()).st_size
+                self._entries[key] = size
+                self._bytes += size
+            self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return f
+
+    def temp_path(self, key: str) -> str:
+        """Where a writer should put the file before commit() moves it into place."""
+        return os.path.join(self.directory, f"{key}.{uuid.uuid4().hex}.tmp")
+
+    def commit(self, key: str, tmp_path: str) -> str:
+        path = self.path_for(key)
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+        with self._lock:
+            self._bytes -= self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._bytes += size
+            self._evict()
+        return path
+
+    def put(self, key: str, data: bytes) -> str:
+        tmp_path = self.temp_path(key)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        return self.commit(key, tmp_path)
+
+    def _evict(self) -> None:
+        # Oldest first; never evict the entry that was just written
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self.path_for(key))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,334 @@
+# backend/app/services/file_store.py
+#
+# File-based session repository (SESSION_BACKEND=json). Each session is
+#   sessions/{id}.json           header + snapshot: metadata, compacted answers, version
+#   sessions/{id}.answers.jsonl  append-only log of answers since the last compaction
+# Pre-existing {id}.json files are valid snapshots with an empty log.
+#
+# An answer is one O_APPEND write of one line, so its cost does not grow
+# with the session and a crash can at worst tear the last line (which is
+# ignored on read). Compaction folds the log back into the snapshot.
+
+import os
+import json
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl  # POSIX only; without it locking is per process
+except ImportError:
+    fcntl = None
+
+from app.services.session_aggregates import add_answer, session_aggregates
+from app.services.session_repository import (
+    SessionRepository,
+    next_version,
+    session_version,
+)
+
+LOG_SUFFIX = ".answers.jsonl"
+# Bytes read per step when scanning backwards for the last log line
+_TAIL_BLOCK = 8192
+
+
+class FileSessionRepository(SessionRepository):
+    def __init__(self, directory: str, fsync: str = "always", compact_bytes: int = 1024 * 1024):
+        self.directory = directory
+        self.fsync = fsync
+        self.compact_bytes = compact_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self.compactions = 0
+
+    # ------------------------------------------------------------------
+    #  PATHS + LOCKING
+    # ------------------------------------------------------------------
+
+    def header_path(self, session_id: str) -> str:
+        return os.path.join(self.directory, f"{session_id}.json")
+
+    def log_path(self, session_id: str) -> str:
+        return os.path.join(self.directory, f"{session_id}{LOG_SUFFIX}")
+
+    def _thread_lock(self, session_id: str) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(session_id)
+            if lock is None:
+                lock = self._locks[session_id] = threading.Lock()
+            return lock
+
+    @contextmanager
+    def _exclusive(self, session_id: str) -> Iterator[int]:
+        """
+        Exclusive access to a session across threads (threading.Lock) and
+        worker processes (flock on the log file). Yields the log's fd,
+        opened for reading and appending.
+        """
+        with self._thread_lock(session_id):
+            fd = os.open(self.log_path(session_id), os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                yield fd
+            finally:
+                os.close(fd)  # releases the flock
+
+    @contextmanager
+    def _shared(self, session_id: str) -> Iterator[Optional[int]]:
+        """
+        Shared lock for readers, so a compaction cannot move answers from
+        the log into the header between reading one and the other. Yields
+        the log's fd for reading, or None if nothing was ever appended.
+        """
+        try:
+            fd = os.open(self.log_path(session_id), os.O_RDONLY)
+        except FileNotFoundError:
+            yield None
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_SH)
+            yield fd
+        finally:
+            os.close(fd)
+
+    # ------------------------------------------------------------------
+    #  HEADER + LOG I/O
+    # ------------------------------------------------------------------
+
+    def _sync(self, fd: int) -> None:
+        if self.fsync == "always":
+            os.fsync(fd)
+
+    def _read_header(self, session_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.header_path(session_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write_header(self, session_data: Dict[str, Any]) -> None:
+        path = self.header_path(session_data["session_id"])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(session_data, f, indent=2)
+            f.flush()
+            self._sync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _iter_log(fd: int) -> Iterator[Dict[str, Any]]:
+        """
+        Log entries in order. Torn lines (an unterminated tail, or one
+        terminated by an older version's next append) are skipped.
+        """
+        with os.fdopen(os.dup(fd), "rb") as f:
+            f.seek(0)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    @staticmethod
+    def _last_line(fd: int) -> Tuple[Optional[bytes], int]:
+        """
+        The last newline-terminated log line, read backwards from the end
+        of the file, and the offset just past it. Anything beyond that
+        offset is a torn write.
+        """
+        size = os.fstat(fd).st_size
+        if size == 0:
+            return None, 0
+
+        buf = b""  # covers [pos, size)
+        pos = size
+        end = None  # offset just past the last newline
+        while pos > 0:
+            step = min(_TAIL_BLOCK, pos)
+            pos -= step
+            buf = os.pread(fd, step, pos) + buf
+            if end is None:
+                cut = buf.rfind(b"\n")
+                if cut < 0:
+                    continue
+                end = pos + cut + 1
+            start = buf.rfind(b"\n", 0, end - 1 - pos)
+            if start >= 0:
+                return buf[start + 1:end - pos], end
+
+        if end is None:
+            return None, 0
+        return buf[:end], end
+
+    @staticmethod
+    def _entry(line: Optional[bytes]) -> Optional[Dict[str, Any]]:
+        """A log line parsed, or None if there is none or it is corrupt."""
+        if line is None:
+            return None
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            return None
+        return entry if isinstance(entry, dict) and "version" in entry else None
+
+    def _merged(self, header: Dict[str, Any], log_fd: Optional[int]) -> Dict[str, Any]:
+        questions = list(header.get("questions", []))
+        version = session_version(header)
+        aggregates = header.get("aggregates")
+        if log_fd is not None:
+            for entry in self._iter_log(log_fd):
+                # Entries already folded into the snapshot (a compaction
+                # interrupted before truncating the log) are skipped
+                if entry["position"] != len(questions):
+                    continue
+                questions.append(entry["answer"])
+                version = entry["version"]
+                aggregates = entry.get("aggregates")
+        header["questions"] = questions
+        header["version"] = version
+        if aggregates is not None:
+            header["aggregates"] = aggregates
+        return header
+
+    # ------------------------------------------------------------------
+    #  REPOSITORY
+    # ------------------------------------------------------------------
+
+    def create(self, session_data: Dict[str, Any]) -> None:
+        with self._exclusive(session_data["session_id"]) as fd:
+            os.ftruncate(fd, 0)
+            self._write_header(session_data)
+
+    def exists(self, session_id: str) -> bool:
+        return os.path.exists(self.header_path(session_id))
+
+    def change_stamp(self, session_id: str) -> Optional[Hashable]:
+        # Header rewrites replace the file (new inode/mtime); appends grow the log
+        try:
+            header = os.stat(self.header_path(session_id))
+        except FileNotFoundError:
+            return None
+        try:
+            log = os.stat(self.log_path(session_id))
+            log_stamp = (log.st_size, log.st_mtime_ns)
+        except FileNotFoundError:
+            log_stamp = None
+        return header.st_ino, header.st_mtime_ns, log_stamp
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._shared(session_id) as fd:
+            header = self._read_header(session_id)
+            if header is None:
+                return None
+            return self._merged(header, fd)
+
+    def peek_version(self, session_id: str) -> Optional[str]:
+        # The last log entry carries the current version, so the answers
+        # themselves are only parsed when the log is empty (or its last
+        # line is corrupt)
+        with self._shared(session_id) as fd:
+            line = None
+            if fd is not None:
+                line, _ = self._last_line(fd)
+                last = self._entry(line)
+                if last is not None:
+                    return last["version"]
+            header = self._read_header(session_id)
+            if header is None:
+                return None
+            if line is not None:
+                header = self._merged(header, fd)
+            return session_version(header)
+
+    def append_answer(self, session_id: str, answer: Dict[str, Any]) -> str:
+        if not self.exists(session_id):
+            raise FileNotFoundError(f"Session not found: {session_id}")
+
+        with self._exclusive(session_id) as fd:
+            # Position, version and aggregates all continue from the last
+            # log entry, so the answers themselves are not read
+            line, end = self._last_line(fd)
+            if end != os.fstat(fd).st_size:
+                # Drop a torn line left by a crash. Terminating it instead
+                # could turn it into a valid entry at the position this
+                # answer is about to take, hiding the new answer.
+                os.ftruncate(fd, end)
+            last = self._entry(line)
+            if last is not None and "aggregates" in last:
+                position, version, aggregates = last["position"] + 1, last["version"], last["aggregates"]
+            else:
+                # Empty log, entries from before aggregates were logged, or
+                # a corrupt last line (skipped by the merge)
+                header = self._read_header(session_id)
+                if header is None:
+                    raise FileNotFoundError(f"Session not found: {session_id}")
+                if line is not None:
+                    header = self._merged(header, fd)
+                position, version = len(header.get("questions", [])), session_version(header)
+                aggregates = session_aggregates(header)
+
+            version = next_version(version, answer)
+            entry = {
+                "position": position,
+                "version": version,
+                "aggregates": add_answer(aggregates, answer),
+                "answer": answer,
+            }
+            os.write(fd, json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n")
+            self._sync(fd)
+
+            if os.fstat(fd).st_size >= self.compact_bytes:
+                self._compact_locked(session_id, fd)
+
+        return version
+
+    def update_fields(self, session_id: str, fields: Dict[str, Any], expected_version: Optional[str] = None) -> bool:
+        if not self.exists(session_id):
+            raise FileNotFoundError(f"Session not found: {session_id}")
+
+        with self._exclusive(session_id) as fd:
+            header = self._read_header(session_id)
+            if header is None:
+                raise FileNotFoundError(f"Session not found: {session_id}")
+            session_data = self._merged(header, fd)
+
+            if expected_version is not None and session_data["version"] != expected_version:
+                return False
+
+            # The header is rewritten anyway, so the log is folded in too
+            session_data.update(fields)
+            self._fold(session_data, fd)
+        return True
+
+    def compact(self, session_id: str) -> None:
+        """Folds the session's answer log into its snapshot."""
+        with self._exclusive(session_id) as fd:
+            self._compact_locked(session_id, fd)
+
+    def _compact_locked(self, session_id: str, fd: int) -> None:
+        header = self._read_header(session_id)
+        if header is None or os.fstat(fd).st_size == 0:
+            return
+        self._fold(self._merged(header, fd), fd)
+
+    def _fold(self, session_data: Dict[str, Any], fd: int) -> None:
+        # Snapshot first, then truncate: a crash in between leaves log
+        # entries whose positions the snapshot already covers
+        self._write_header(session_data)
+        if os.fstat(fd).st_size:
+            os.ftruncate(fd, 0)
+            self._sync(fd)
+            self.compactions += 1
+
+    def list_ids(self) -> List[str]:
+        return sorted(
+            name[:-len(".json")]
+            for name in os.listdir(self.directory)
+            if name.endswith(".json")
+        )
@@ -0,0 +1,108 @@
+# backend/app/services/frame_sampler.py
+
+import math
+from typing import Iterator
+
+import cv2
+import numpy as np
+
+# Browser (MediaRecorder) webm files often report nonsense fps values
+_FALLBACK_FPS = 30.0
+_MAX_PLAUSIBLE_FPS = 240.0
+
+
+def probe_duration_ms(video_path: str) -> float:
+    """
+    Duration of a video, found by seeking a separate capture to the end
+    (0.0 if the container does not allow it). Used when the frame count
+    is unknown, which is typical for MediaRecorder webm.
+    """
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened() or not cap.set(cv2.CAP_PROP_POS_AVI_RATIO, 1.0):
+            return 0.0
+        duration = cap.get(cv2.CAP_PROP_POS_MSEC) or 0.0
+        return duration if duration > 0 and not math.isnan(duration) else 0.0
+    finally:
+        cap.release()
+
+
+class FrameSampler:
+    """
+    Yields decoded frames at roughly `sample_fps`, stopping after
+    `max_frames` samples.
+
+    Skipped frames are only grab()bed (demuxed/decoded but never
+    retrieved or colour-converted), so decoding still scales with the
+    video length; retrieval is bounded by the budget. When the frame
+    count or `duration_ms` is known the sampling interval is widened so
+    the budget is spread over the whole video. Otherwise frames are picked
+    by timestamp and the interval doubles each time half of the remaining
+    budget is spent, so long answers are still covered past the first
+    max_frames / sample_fps seconds (more densely at the start).
+    """
+
+    def __init__(self, cap: "cv2.VideoCapture", sample_fps: float, max_frames: int, duration_ms: float = 0.0):
+        self.cap = cap
+        self.sample_fps = max(0.1, sample_fps)
+        self.max_frames = max(1, max_frames)
+
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        if math.isnan(fps) or fps <= 0 or fps > _MAX_PLAUSIBLE_FPS:
+            fps = _FALLBACK_FPS
+        self.fps = fps
+
+        total = cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0.0
+        self.total_frames = int(total) if total > 0 and not math.isnan(total) else 0
+
+        self.stride = max(1, round(self.fps / self.sample_fps))
+        self.interval_ms = 1000.0 / self.sample_fps
+        if self.total_frames:
+            self.stride = max(self.stride, math.ceil(self.total_frames / self.max_frames))
+        elif duration_ms > 0:
+            self.interval_ms = max(self.interval_ms, duration_ms / self.max_frames)
+            self.stride = max(self.stride, math.ceil(duration_ms / 1000.0 * self.fps / self.max_frames))
+        self.length_known = bool(self.total_frames or duration_ms > 0)
+
+        self.frames_read = 0
+        self.frames_sampled = 0
+        self.budget_exhausted = False
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        interval_ms = self.interval_ms
+        stride = self.stride
+        next_ms = 0.0
+        use_timestamps = not self.total_frames
+        # Unknown length: sample count at which the interval next doubles
+        widen_at = self.max_frames if self.length_known else self.max_frames // 2
+
+        while self.frames_sampled < self.max_frames:
+            if not self.cap.grab():
+                return
+            index = self.frames_read
+            self.frames_read += 1
+
+            if use_timestamps:
+                pos_ms = self.cap.get(cv2.CAP_PROP_POS_MSEC)
+                if pos_ms > 0 or index == 0:
+                    if pos_ms < next_ms:
+                        continue
+                    next_ms = pos_ms + interval_ms
+                elif index % stride:
+                    # Container gives no timestamps; fall back to a stride
+                    continue
+            elif index % stride:
+                continue
+
+            ok, frame = self.cap.retrieve()
+            if not ok:
+                continue
+
+            self.frames_sampled += 1
+            if self.frames_sampled >= widen_at and self.frames_sampled < self.max_frames:
+                interval_ms *= 2
+                stride *= 2
+                widen_at += max(1, (self.max_frames - widen_at) // 2)
+            yield frame
+
+        self.budget_exhausted = True
@@ -0,0 +1,275 @@
+# backend/app/services/llm_client.py
+
+import asyncio
+import random
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+from app.core.config import settings
+from app.services import llm_resilience
+from app.services.llm_resilience import CircuitOpenError
+
+# Configure Gemini once for the whole process
+if not settings.GEMINI_API_KEY:
+    raise ValueError("GEMINI_API_KEY is not set in environment/.env")
+
+genai.configure(api_key=settings.GEMINI_API_KEY)
+
+# Models used across the app
+MODEL_FLASH = "gemini-2.5-flash"
+MODEL_FLASH_LITE = "gemini-2.5-flash-lite"
+
+# Upstream said "slow down": shrink concurrency and back off
+THROTTLE_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+)
+
+# Transient upstream failures that are worth retrying
+RETRYABLE_ERRORS = THROTTLE_ERRORS + (
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+    asyncio.TimeoutError,
+)
+
+
+class LLMDeadlineExceeded(Exception):
+    pass
+
+
+@lru_cache(maxsize=None)
+def get_model(model_name: str) -> genai.GenerativeModel:
+    """
+    Shared model handle per model name (GenerativeModel is stateless
+    between generate calls, so one instance serves every request).
+    """
+    return genai.GenerativeModel(model_name)
+
+
+# ---------------------------------------------------------------------
+#  FLOW CONTROL
+# ---------------------------------------------------------------------
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` requests per second on average, bursts
+    of up to `burst`. acquire() sleeps until a token is available.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Takes one token; returns how long the caller had to wait."""
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit: grows by roughly one slot per window of
+    successful calls, halves whenever the upstream throttles.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.in_flight = 0
+        self._cond: Optional[asyncio.Condition] = None
+
+    def _condition(self) -> asyncio.Condition:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def acquire(self) -> None:
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, throttled: bool) -> None:
+        cond = self._condition()
+        async with cond:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit / 2)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            cond.notify_all()
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of overall traffic so retries cannot
+    multiply load during an outage: every call deposits `ratio` tokens,
+    every retry spends one.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+
+    def deposit(self) -> None:
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+
+_bucket = TokenBucket(settings.LLM_RATE_PER_S, settings.LLM_BURST)
+_limiter = AdaptiveLimiter(
+    initial=settings.LLM_MAX_CONCURRENCY,
+    minimum=settings.LLM_MIN_CONCURRENCY,
+    maximum=settings.LLM_MAX_CONCURRENCY,
+)
+_retry_budget = RetryBudget(settings.LLM_RETRY_BUDGET_RATIO, settings.LLM_RETRY_BUDGET_MAX)
+
+_counters: Dict[str, Dict[str, int]] = {}
+
+
+def _count(site: str, name: str) -> None:
+    site_counters = _counters.setdefault(site, {})
+    site_counters[name] = site_counters.get(name, 0) + 1
+
+
+def record_fallback(site: str) -> None:
+    """Call sites report here when they return a canned/fallback result."""
+    _count(site, "fallbacks")
+
+
+def _backoff(attempt: int) -> float:
+    # "Full jitter" exponential backoff
+    cap = min(settings.LLM_BACKOFF_MAX_S, settings.LLM_BACKOFF_BASE_S * (2 ** attempt))
+    return random.uniform(0, cap)
+
+
+# ---------------------------------------------------------------------
+#  CALLS
+# ---------------------------------------------------------------------
+
+async def _attempt(model: genai.GenerativeModel, contents: Any, timeout: float) -> str:
+    # Waiting for a concurrency slot counts against the timeout too
+    expires = time.monotonic() + timeout
+    await asyncio.wait_for(_limiter.acquire(), timeout)
+    throttled = False
+    try:
+        response = await asyncio.wait_for(
+            model.generate_content_async(contents), max(0.0, expires - time.monotonic())
+        )
+        return (response.text or "").strip()
+    except THROTTLE_ERRORS:
+        throttled = True
+        raise
+    finally:
+        await _limiter.release(throttled)
+
+
+async def _generate_with_retries(model: genai.GenerativeModel, contents: Any, site: str, deadline: float) -> str:
+    expires = time.monotonic() + deadline
+    _retry_budget.deposit()
+
+    attempt = 0
+    while True:
+        if await _bucket.acquire() > 0:
+            _count(site, "rate_limited")
+
+        remaining = expires - time.monotonic()
+        if remaining <= 0:
+            _count(site, "deadline_exceeded")
+            raise LLMDeadlineExceeded(f"{site}: deadline of {deadline}s exceeded")
+
+        try:
+            return await _attempt(model, contents, remaining)
+        except RETRYABLE_ERRORS as e:
+            if isinstance(e, THROTTLE_ERRORS):
+                _count(site, "throttles")
+            if isinstance(e, asyncio.TimeoutError) and time.monotonic() >= expires:
+                _count(site, "deadline_exceeded")
+                raise LLMDeadlineExceeded(f"{site}: deadline of {deadline}s exceeded")
+
+            delay = _backoff(attempt)
+            attempt += 1
+            if (
+                attempt > settings.LLM_MAX_RETRIES
+                or time.monotonic() + delay >= expires
+                or not _retry_budget.try_spend()
+            ):
+                _count(site, "errors")
+                raise
+
+            _count(site, "retries")
+            await asyncio.sleep(delay)
+        except Exception:
+            _count(site, "errors")
+            raise
+
+
+async def generate_text(
+    contents: Any,
+    *,
+    model_name: str,
+    site: str = "default",
+    deadline: Optional[float] = None,
+) -> str:
+    """
+    Non-blocking generate_content call with flow control.
+
+    Requests pass a token-bucket rate limit and an AIMD concurrency
+    limit; transient errors are retried with jittered backoff while the
+    shared retry budget and the per-call `deadline` (seconds, default
+    LLM_DEADLINE_S) allow. On top of that each `site` gets the hedging /
+    circuit-breaker policy from LLM_SITE_POLICIES; an open breaker raises
+    CircuitOpenError so callers can switch to their degraded path.
+    `contents` is anything generate_content accepts. Returns the
+    stripped response text.
+    """
+    model = get_model(model_name)
+    deadline = settings.LLM_DEADLINE_S if deadline is None else deadline
+
+    _count(site, "calls")
+    try:
+        return await llm_resilience.for_site(site).run(
+            lambda: _generate_with_retries(model, contents, site, deadline)
+        )
+    except CircuitOpenError:
+        _count(site, "circuit_open")
+        raise
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "concurrency_limit": round(_limiter.limit, 2),
+        "max_concurrency": _limiter.maximum,
+        "in_flight": _limiter.in_flight,
+        "retry_budget_tokens": round(_retry_budget._tokens, 2),
+        "sites": {site: dict(c) for site, c in _counters.items()},
+        "resilience": llm_resilience.stats(),
+    }
@@ -0,0 +1,231 @@
+# backend/app/services/llm_resilience.py
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling upstream while a site's breaker is open."""
+
+
+class LatencyTracker:
+    """Sliding window of successful call latencies (seconds)."""
+
+    def __init__(self, window: int = 200):
+        self._samples: deque = deque(maxlen=window)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[index]
+
+
+class CircuitBreaker:
+    """
+    Opens when the error rate over the last `window` calls reaches
+    `error_rate` (with at least `min_calls` observed). While open every
+    call fails fast; after `cooldown_s` a single probe is let through
+    (half-open) and its outcome closes or re-opens the breaker. Outcomes
+    of other calls that finish while the breaker is open (started before
+    it opened) are ignored.
+    """
+
+    def __init__(self, error_rate: float, min_calls: int, window: int, cooldown_s: float):
+        self.error_rate = error_rate
+        self.min_calls = min_calls
+        self.cooldown_s = cooldown_s
+        self._outcomes: deque = deque(maxlen=window)
+        self._opened_at: Optional[float] = None
+        # Id of the half-open probe in flight; only its outcome counts
+        self._probe: Optional[int] = None
+        self._probe_ids = itertools.count(1)
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.cooldown_s:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and self._probe is None:
+            self._probe = next(self._probe_ids)
+            return True
+        return False
+
+    @property
+    def probe(self) -> Optional[int]:
+        """Id of the probe admitted by the last allow() in half-open state."""
+        return self._probe
+
+    def release_probe(self, probe: int) -> None:
+        """The probe ended without an outcome (cancelled); let the next call probe."""
+        if self._probe == probe:
+            self._probe = None
+
+    def record(self, ok: bool, probe: Optional[int] = None) -> None:
+        if self._opened_at is not None:
+            if probe is None or probe != self._probe:
+                return  # not the current probe: a late outcome from before the trip
+            self._probe = None
+            if ok:
+                self._opened_at = None
+                self._outcomes.clear()
+            else:
+                self._opened_at = time.monotonic()
+            return
+
+        self._outcomes.append(ok)
+        failures = self._outcomes.count(False)
+        if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.error_rate:
+            self._opened_at = time.monotonic()
+            self.trips += 1
+
+    def error_rate_now(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+
+class SiteResilience:
+    """
+    Hedging + circuit breaking for one LLM call site.
+
+    With hedging on, a duplicate request is started once the first has
+    been running longer than the observed `hedge_percentile` latency
+    (never sooner than `hedge_min_delay_s`); whichever finishes first
+    wins and the other is cancelled.
+    """
+
+    def __init__(self, site: str, policy: Dict[str, Any]):
+        self.site = site
+        self.hedge = bool(policy.get("hedge", False))
+        self.hedge_percentile = float(policy.get("hedge_percentile", 0.95))
+        self.hedge_min_delay_s = float(policy.get("hedge_min_delay_s", 2.0))
+        self.hedge_min_samples = int(policy.get("hedge_min_samples", 20))
+
+        self.latency = LatencyTracker()
+        self.breaker: Optional[CircuitBreaker] = None
+        if policy.get("breaker", True):
+            self.breaker = CircuitBreaker(
+                error_rate=float(policy.get("breaker_error_rate", 0.5)),
+                min_calls=int(policy.get("breaker_min_calls", 10)),
+                window=int(policy.get("breaker_window", 50)),
+                cooldown_s=float(policy.get("breaker_cooldown_s", 30)),
+            )
+
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.rejected = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        if not self.hedge or len(self.latency) < self.hedge_min_samples:
+            return None
+        observed = self.latency.percentile(self.hedge_percentile) or 0.0
+        return max(self.hedge_min_delay_s, observed)
+
+    async def _hedged(self, call: Callable[[], Awaitable[Any]], delay: float) -> Any:
+        primary = asyncio.ensure_future(call())
+        pending = {primary}
+        error: Optional[BaseException] = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+
+            self.hedges_sent += 1
+            backup = asyncio.ensure_future(call())
+            pending = {primary, backup}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.hedges_won += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # Also reached when our caller is cancelled while waiting
+            for task in pending:
+                task.cancel()
+
+    async def run(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        if self.breaker is not None and not self.breaker.allow():
+            self.rejected += 1
+            raise CircuitOpenError(f"{self.site}: circuit open")
+        probe = self.breaker.probe if self.breaker is not None else None
+
+        started = time.monotonic()
+        try:
+            delay = self.hedge_delay()
+            if delay is None:
+                result = await call()
+            else:
+                result = await self._hedged(call, delay)
+        except asyncio.CancelledError:
+            # Not an upstream failure, but a cancelled half-open probe
+            # must not leave the breaker waiting for it forever
+            if probe is not None:
+                self.breaker.release_probe(probe)
+            raise
+        except Exception:
+            if self.breaker is not None:
+                self.breaker.record(False, probe)
+            raise
+
+        self.latency.add(time.monotonic() - started)
+        if self.breaker is not None:
+            self.breaker.record(True, probe)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        p95 = self.latency.percentile(0.95)
+        data: Dict[str, Any] = {
+            "hedge": self.hedge,
+            "hedge_delay_s": self.hedge_delay(),
+            "p95_s": round(p95, 3) if p95 is not None else None,
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+        }
+        if self.breaker is not None:
+            data.update({
+                "breaker_state": self.breaker.state,
+                "breaker_error_rate": round(self.breaker.error_rate_now(), 3),
+                "breaker_trips": self.breaker.trips,
+                "breaker_rejected": self.rejected,
+            })
+        return data
+
+
+_sites: Dict[str, SiteResilience] = {}
+
+
+def for_site(site: str) -> SiteResilience:
+    resilience = _sites.get(site)
+    if resilience is None:
+        policy = settings.LLM_SITE_POLICIES.get(site) or settings.LLM_SITE_POLICIES.get("default", {})
+        resilience = _sites[site] = SiteResilience(site, policy)
+    return resilience
+
+
+def stats() -> Dict[str, Any]:
+    return {site: r.stats() for site, r in _sites.items()}
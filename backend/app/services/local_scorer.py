@@ -0,0 +1,99 @@
+# backend/app/services/local_scorer.py
+#
+# Degraded, LLM-free stand-ins used while a Gemini call site's circuit
+# breaker is open. They are deliberately simple and say so in their output.
+
+import re
+from typing import Any, Dict, List
+
+FILLER_WORDS = {"uh", "um", "erm", "hmm", "like", "basically", "actually", "literally"}
+STRUCTURE_MARKERS = {
+    "situation", "task", "action", "result", "first", "second", "then",
+    "finally", "because", "so", "therefore", "example", "outcome",
+}
+HEDGE_WORDS = {"maybe", "probably", "guess", "think", "kind", "sort", "dunno"}
+
+
+def _clamp(value: float) -> float:
+    return round(max(1.0, min(10.0, value)), 1)
+
+
+def score_answer_locally(question: str, transcript: str) -> Dict[str, Any]:
+    """
+    Heuristic scores from transcript length, filler words, structure
+    markers and hedging. Same shape as score_answer_gemini().
+    """
+    words = re.findall(r"[a-zA-Z']+", (transcript or "").lower())
+    n = len(words)
+
+    if n == 0:
+        return {
+            "content_score": 1,
+            "structure_score": 1,
+            "clarity_score": 1,
+            "confidence_score": 1,
+            "feedback": "No spoken answer was detected. (Automated estimate; AI scoring was unavailable.)",
+            "scoring_mode": "degraded",
+        }
+
+    question_terms = set(re.findall(r"[a-zA-Z']{4,}", (question or "").lower()))
+    overlap = len(question_terms & set(words)) / max(1, len(question_terms))
+    fillers = sum(1 for w in words if w in FILLER_WORDS) / n
+    markers = len(STRUCTURE_MARKERS & set(words))
+    hedges = sum(1 for w in words if w in HEDGE_WORDS) / n
+
+    # ~150 words is a well-developed spoken answer
+    length = min(1.0, n / 150)
+
+    return {
+        "content_score": _clamp(2 + 5 * length + 3 * overlap),
+        "structure_score": _clamp(2 + 4 * length + markers),
+        "clarity_score": _clamp(8 - 40 * fillers + 2 * length),
+        "confidence_score": _clamp(8 - 40 * hedges - 20 * fillers + length),
+        "feedback": (
+            "This is an automated estimate because AI scoring was temporarily unavailable. "
+            "It is based on answer length, relevance to the question, use of structure words "
+            "and filler words; re-score the session later for detailed feedback."
+        ),
+        "scoring_mode": "degraded",
+    }
+
+
+def summarize_locally(role, seniority, questions: List[Dict[str, Any]], overall: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Template summary built from the average scores. Same shape as
+    run_gemini_summary().
+    """
+    labels = {
+        "content_score": "answer content",
+        "structure_score": "answer structure",
+        "clarity_score": "clarity",
+        "confidence_score": "confidence",
+    }
+    scores = {k: float(overall.get(k) or 0) for k in labels}
+    ranked = sorted(scores, key=scores.get, reverse=True)
+
+    return {
+        "strengths": [f"Relatively strongest area: {labels[k]} ({scores[k]}/10)." for k in ranked[:2]],
+        "improvements": [f"Focus on {labels[k]} ({scores[k]}/10)." for k in ranked[-2:]],
+        "summary": (
+            f"The candidate answered {len(questions)} question(s) for the {role} ({seniority}) role. "
+            "This summary was generated from the average scores because the AI summary "
+            "service was temporarily unavailable."
+        ),
+        "summary_mode": "degraded",
+    }
+
+
+def fallback_questions(role: str, seniority: str, num_questions: int) -> List[str]:
+    """Generic interview questions when question generation is unavailable."""
+    questions = [
+        f"Why are you interested in this {role} role?",
+        "Tell me about a challenging project you worked on and your specific contribution.",
+        "Describe a time you disagreed with a teammate. How did you resolve it?",
+        f"Which skills do you think matter most for a {seniority} {role}, and how have you shown them?",
+        "Tell me about a mistake you made at work and what you learned from it.",
+        "How do you prioritise when you have several deadlines at once?",
+        "Describe a situation where you had to learn something new quickly.",
+    ]
+    return questions[:num_questions]
@@ -1,13 +1,9 @@
 import json
 from typing import Dict, Any
 
-import google.generativeai as genai
+from app.services.llm_client import MODEL_FLASH_LITE, generate_text
 
-from app.core.config import settings
-
-genai.configure(api_key=settings.GEMINI_API_KEY)
-
-MODEL_NAME = "gemini-2.5-flash-lite"
+MODEL_NAME = MODEL_FLASH_LITE
 
 
 EVAL_SYSTEM_PROMPT = """
@@ -29,7 +25,7 @@ Do NOT add extra keys or text. Only output valid JSON.
 """.strip()
 
 
-def evaluate_answer(
+async def evaluate_answer(
     question: str,
     answer: str,
     role: str,
@@ -39,8 +35,6 @@ def evaluate_answer(
     Use Gemini to evaluate the transcript of an answer and return scores + feedback.
     """
 
-    model = genai.GenerativeModel(MODEL_NAME)
-
     user_prompt = f"""
 Role: {role}
 Seniority: {seniority}
@@ -52,15 +46,15 @@ Candidate answer transcript:
 {answer}
 """.strip()
 
-    response = model.generate_content(
+    raw_text = await generate_text(
         [
             EVAL_SYSTEM_PROMPT,
             user_prompt,
-        ]
+        ],
+        model_name=MODEL_NAME,
+        site="evaluation",
     )
 
-    raw_text = (response.text or "").strip()
-
     try:
         data = json.loads(raw_text)
     except json.JSONDecodeError:
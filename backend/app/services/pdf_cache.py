@@ -0,0 +1,20 @@
+# backend/app/services/pdf_cache.py
+
+from app.core.config import settings
+from app.services.file_cache import FileCache
+
+
+class PdfCache(FileCache):
+    """
+    Rendered report PDFs. Keys are "{session_id}-{version}-{template}", so
+    a new answer or a different template simply misses.
+    """
+
+    suffix = ".pdf"
+
+    @staticmethod
+    def key(session_id: str, version: str, template: str) -> str:
+        return f"{session_id}-{version}-{template}"
+
+
+pdf_cache = PdfCache(settings.PDF_CACHE_DIR, settings.PDF_CACHE_MAX_BYTES)
@@ -0,0 +1,174 @@
+# backend/app/services/process_pool.py
+
+import asyncio
+import multiprocessing
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+
+def _caller_cancelled() -> bool:
+    task = asyncio.current_task()
+    cancelling = getattr(task, "cancelling", None)  # Python 3.11+
+    return bool(cancelling()) if cancelling is not None else False
+
+
+class JobTimeoutError(Exception):
+    pass
+
+
+class ManagedProcessPool:
+    """
+    Process pool with an explicit lifecycle (started/stopped from the app
+    lifespan) and per-job timeouts.
+
+    A job that overruns its timeout cannot be interrupted inside a
+    ProcessPoolExecutor, so the whole pool is recycled: its workers are
+    terminated and a fresh pool is created for the next job. Other jobs
+    that were running or queued on the terminated pool are retried once
+    on the fresh pool, and the pool reports not ready until it is warm
+    again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        initializer: Optional[Callable[[], Any]] = None,
+        default_timeout: Optional[float] = None,
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.initializer = initializer
+        self.default_timeout = default_timeout
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._ready = False
+        self._recycles = 0
+        self._timeouts = 0
+        self._retries = 0
+        # Executors terminated by _recycle: their BrokenProcessPool errors
+        # are collateral, not caused by the job that sees them
+        self._terminated: "weakref.WeakSet[ProcessPoolExecutor]" = weakref.WeakSet()
+        self._warm_task: Optional["asyncio.Task"] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # "spawn" keeps heavy model state out of the API process
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=self.initializer,
+        )
+
+    def start(self) -> None:
+        with self._lock:
+            if self._executor is None and self.enabled:
+                self._executor = self._new_executor()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._ready = False
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _recycle(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is not broken:
+                return  # someone else already replaced it
+            self._executor = self._new_executor()
+            self._recycles += 1
+            self._ready = False
+            self._terminated.add(broken)
+
+        # ProcessPoolExecutor offers no public way to kill a running job
+        for proc in list((getattr(broken, "_processes", None) or {}).values()):
+            try:
+                proc.terminate()
+            except Exception:
+                pass
+        # Queued jobs are not cancelled: they fail with BrokenProcessPool
+        # like the running ones, and run() resubmits them
+        broken.shutdown(wait=False, cancel_futures=False)
+
+        if self.initializer is None:
+            self._ready = True
+        else:
+            self._warm_task = asyncio.get_running_loop().create_task(self._rewarm())
+
+    async def _rewarm(self) -> None:
+        try:
+            await self.warm_up()
+        except Exception as e:
+            print(f"{self.name} pool warm-up after recycle failed:", e)
+
+    async def warm_up(self) -> None:
+        """
+        Submit one warm-up job per worker so every process has run its
+        initializer before real traffic arrives.
+        """
+        if not self.enabled or self.initializer is None:
+            self._ready = True
+            return
+        executor = self._executor
+        if executor is None:
+            return  # shut down
+        await asyncio.gather(
+            *(self.run(self.initializer) for _ in range(self.max_workers))
+        )
+        # A recycle during warm-up schedules its own
+        if self._executor is executor:
+            self._ready = True
+
+    def is_ready(self) -> bool:
+        return self._ready
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        timeout = self.default_timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+
+        for attempt in (1, 2):
+            self.start()
+            executor = self._executor
+            if executor is None:
+                raise RuntimeError(f"{self.name} pool is not running")
+
+            future = loop.run_in_executor(executor, fn, *args)
+            try:
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                self._recycle(executor)
+                raise JobTimeoutError(f"{self.name} job exceeded {timeout}s")
+            except BrokenProcessPool:
+                if attempt == 1 and executor in self._terminated:
+                    # Killed by another job's timeout: once more on the new pool
+                    self._retries += 1
+                    continue
+                self._recycle(executor)
+                raise
+            except asyncio.CancelledError:
+                # The job's future was cancelled by the recycle (not our
+                # caller): treat it like a collateral BrokenProcessPool
+                if executor not in self._terminated or _caller_cancelled():
+                    raise
+                if attempt == 2:
+                    raise JobTimeoutError(f"{self.name} job lost in a pool recycle")
+                self._retries += 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "running": self._executor is not None,
+            "ready": self._ready,
+            "timeouts": self._timeouts,
+            "recycles": self._recycles,
+            "retries": self._retries,
+        }
@@ -2,18 +2,11 @@
 
 from __future__ import annotations
 
-import google.generativeai as genai
+from app.services.llm_client import MODEL_FLASH_LITE, CircuitOpenError, generate_text, record_fallback
+from app.services.local_scorer import fallback_questions
 
-from app.core.config import settings
 
-# Configure Gemini once
-if not settings.GEMINI_API_KEY:
-    raise ValueError("GEMINI_API_KEY is not set in environment/.env")
-
-genai.configure(api_key=settings.GEMINI_API_KEY)
-
-
-def generate_questions(
+async def generate_questions(
     resume_text: str,
     role: str,
     seniority: str,
@@ -49,11 +42,11 @@ def generate_questions(
     ...
     """
 
-    model = genai.GenerativeModel("gemini-2.5-flash-lite")
-
-    response = model.generate_content(prompt)
-
-    raw = (response.text or "").strip()
+    try:
+        raw = await generate_text(prompt, model_name=MODEL_FLASH_LITE, site="questions")
+    except CircuitOpenError:
+        record_fallback("questions")
+        return fallback_questions(role, seniority, num_questions)
 
     # Split into lines and clean
     lines = [line.strip() for line in raw.split("\n") if line.strip()]
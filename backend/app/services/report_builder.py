@@ -1,9 +1,12 @@
 # backend/app/services/report_builder.py
 
 import os
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+from io import BytesIO
 
 from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
 from reportlab.platypus import (
     SimpleDocTemplate,
     Paragraph,
@@ -16,7 +19,9 @@ from reportlab.lib.enums import TA_LEFT
 from reportlab.lib import colors
 
 
+@lru_cache(maxsize=1)
 def _get_styles():
+    # Built once per process; the stylesheet is only read after this
     styles = getSampleStyleSheet()
 
     styles.add(
@@ -64,6 +69,164 @@ def _get_styles():
     return styles
 
 
+def build_simple_pdf(
+    session_id: str,
+    role: str,
+    seniority: str,
+    questions: List[Dict[str, Any]],
+    overall: Dict[str, Any],
+    ai_summary: Dict[str, Any],
+    output_path: Optional[str] = None,
+) -> bytes:
+    """
+    Build a simple but clean PDF report using reportlab.
+
+    With `output_path` the canvas writes straight to that file (nothing
+    is buffered in memory) and b"" is returned.
+    """
+
+    buffer = BytesIO() if output_path is None else None
+    c = canvas.Canvas(output_path or buffer, pagesize=A4)
+    width, height = A4
+
+    margin = 40
+    y = height - margin
+
+    def write_line(text: str, size: int = 11, bold: bool = False, leading: int = 14):
+        nonlocal y
+        if y < margin + leading:
+            c.showPage()
+            y = height - margin
+
+        if bold:
+            c.setFont("Helvetica-Bold", size)
+        else:
+            c.setFont("Helvetica", size)
+
+        c.drawString(margin, y, text[:120])  # truncate long lines
+        y -= leading
+
+    # Header
+    write_line("Interview Performance Report", size=16, bold=True, leading=22)
+    write_line(f"Session ID: {session_id}", size=9)
+    write_line(f"Role: {role} | Level: {seniority}", size=10)
+    write_line(" ", size=8)
+
+    # Overall scores
+    write_line("Overall Scores", size=13, bold=True, leading=18)
+    write_line(f"Content: {overall.get('content_score', '-')} / 10")
+    write_line(f"Structure: {overall.get('structure_score', '-')} / 10")
+    write_line(f"Clarity: {overall.get('clarity_score', '-')} / 10")
+    write_line(f"Confidence: {overall.get('confidence_score', '-')} / 10")
+    emo_summary = overall.get("emotion_summary") or {}
+    write_line(
+        f"Dominant Emotion: {emo_summary.get('dominant_emotion', 'unknown')}",
+        size=10,
+    )
+    write_line(" ", size=8)
+
+    # AI summary
+    if ai_summary:
+        strengths = ai_summary.get("strengths") or []
+        improvements = ai_summary.get("improvements") or []
+        summary = ai_summary.get("summary") or ""
+
+        write_line("AI Summary", size=13, bold=True, leading=18)
+        if summary:
+            for line in summary.split(". "):
+                if line.strip():
+                    write_line(f"- {line.strip()}", size=10)
+        write_line(" ", size=6)
+
+        if strengths:
+            write_line("Strengths:", size=12, bold=True, leading=16)
+            for s in strengths:
+                write_line(f"• {s}", size=10)
+            write_line(" ", size=6)
+
+        if improvements:
+            write_line("Areas to Improve:", size=12, bold=True, leading=16)
+            for s in improvements:
+                write_line(f"• {s}", size=10)
+            write_line(" ", size=10)
+
+    # Per-question breakdown
+    write_line("Question-wise Breakdown", size=13, bold=True, leading=18)
+
+    for idx, q in enumerate(questions, start=1):
+        q_text = q.get("question_text") or "Question text not available."
+        transcript = q.get("transcript") or "Transcript not available."
+        content = q.get("content_score", "-")
+        structure = q.get("structure_score", "-")
+        clarity = q.get("clarity_score", "-")
+        confidence = q.get("confidence_score", "-")
+        expr = q.get("expression") or {}
+        dom_emo = expr.get("dominant_emotion", "unknown")
+        feedback = q.get("feedback") or ""
+
+        write_line(f"Q{idx}: {q_text}", size=11, bold=True, leading=14)
+        write_line(f"Transcript: {transcript}", size=9, leading=12)
+        write_line(
+            f"Scores - Content: {content}, Structure: {structure}, "
+            f"Clarity: {clarity}, Confidence: {confidence}",
+            size=9,
+            leading=12,
+        )
+        write_line(f"Dominant Emotion: {dom_emo}", size=9, leading=12)
+        if feedback:
+            write_line(f"Feedback: {feedback}", size=9, leading=12)
+        write_line(" ", size=6)
+
+    c.showPage()
+    c.save()
+
+    if buffer is None:
+        return b""
+
+    pdf_bytes = buffer.getvalue()
+    buffer.close()
+    return pdf_bytes
+
+
+def render_report_pdf(
+    session_id: str,
+    session_data: Dict[str, Any],
+    report: Dict[str, Any],
+    template: str,
+    output_path: str,
+) -> str:
+    """
+    Render a session report to `output_path` with the given template
+    ("simple" canvas layout or "detailed" platypus layout). Top-level and
+    reportlab-only so it can run in a worker process.
+    """
+    questions = session_data.get("questions", [])
+
+    if template == "detailed":
+        return build_pdf_report(
+            session_id,
+            {
+                "role": session_data.get("role", "Not specified"),
+                "seniority": session_data.get("seniority", "Not specified"),
+                "questions": questions,
+                # build_pdf_report reads strengths/improvements/summary from "overall"
+                "overall": {**report["overall"], **report["ai_summary"]},
+            },
+            output_path,
+        )
+
+    build_simple_pdf(
+        session_id=session_id,
+        role=session_data.get("role", "Unknown role"),
+        seniority=session_data.get("seniority", "Unknown level"),
+        questions=questions,
+        overall=report["overall"],
+        ai_summary=report["ai_summary"],
+        output_path=output_path,
+    )
+    return output_path
+
+
 def _p(text: str, style: ParagraphStyle):
     """
     Helper: safe Paragraph creator.
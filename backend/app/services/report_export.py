@@ -0,0 +1,120 @@
+# backend/app/services/report_export.py
+
+import asyncio
+import itertools
+import zipfile
+from typing import AsyncIterator, BinaryIO, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.services.report_service import get_report_pdf
+from app.services.session_index import session_index
+from app.services.session_store import load_session
+
+EXPORT_TEMPLATE = "detailed"
+
+
+class _ZipSink:
+    """
+    Write-only file object for zipfile: collects the bytes zipfile writes
+    so they can be yielded and dropped as the archive is produced.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def resolve_session_ids(
+    session_ids: Optional[List[str]] = None,
+    role: Optional[str] = None,
+    seniority: Optional[str] = None,
+) -> List[str]:
+    """Explicit ids, or every session matching the role/seniority filter."""
+    if session_ids:
+        return list(dict.fromkeys(session_ids))
+    return session_index.session_ids(role=role, seniority=seniority)
+
+
+async def _render_one(session_id: str, template: str) -> Tuple[str, Optional[BinaryIO], Optional[str]]:
+    """Returns (session_id, open pdf file, error)."""
+    session_data = await asyncio.to_thread(load_session, session_id)
+    if session_data is None:
+        return session_id, None, "session not found"
+    try:
+        # Reuses the memoized summary and the PDF cache when present
+        _, pdf_file = await get_report_pdf(session_id, session_data, template)
+    except Exception as e:
+        return session_id, None, str(e)
+    return session_id, pdf_file, None
+
+
+async def stream_reports_zip(session_ids: List[str], template: str = EXPORT_TEMPLATE) -> AsyncIterator[bytes]:
+    """
+    Renders the sessions' PDFs concurrently (rendering itself in the PDF
+    process pool) and yields a ZIP archive incrementally, adding each PDF
+    as soon as it is ready. At most EXPORT_CONCURRENCY renders are started
+    ahead of the writer, so the tasks and open PDF files stay bounded
+    whatever the number of sessions. Files are stored uncompressed and
+    copied in chunks, so memory stays bounded by the chunk size rather
+    than the archive size. Failures are listed in errors.txt at the end
+    of the archive.
+    """
+    ids = iter(session_ids)
+    window = max(1, settings.EXPORT_CONCURRENCY)
+    pending: Set["asyncio.Future"] = set()
+    done: Set["asyncio.Future"] = set()
+    sink = _ZipSink()
+    errors: List[str] = []
+
+    try:
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+            while True:
+                for session_id in itertools.islice(ids, window - len(pending)):
+                    pending.add(asyncio.ensure_future(_render_one(session_id, template)))
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                while done:
+                    session_id, pdf_file, error = done.pop().result()
+                    if error is not None:
+                        errors.append(f"{session_id}: {error}")
+                        continue
+
+                    with pdf_file as src, archive.open(
+                        f"interview-report-{session_id}.pdf", "w", force_zip64=True
+                    ) as dst:
+                        while True:
+                            chunk = src.read(settings.PDF_STREAM_CHUNK_BYTES)
+                            if not chunk:
+                                break
+                            dst.write(chunk)
+                            data = sink.drain()
+                            if data:
+                                yield data
+
+            if errors:
+                archive.writestr("errors.txt", "\n".join(errors) + "\n")
+
+        # Remaining entry data plus the central directory
+        yield sink.drain()
+    finally:
+        for task in pending:
+            task.cancel()
+        # Rendered but never written (client went away): close the files
+        for task in done:
+            if not task.cancelled() and task.exception() is None:
+                pdf_file = task.result()[1]
+                if pdf_file is not None:
+                    pdf_file.close()
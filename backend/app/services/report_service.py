@@ -0,0 +1,201 @@
+# backend/app/services/report_service.py
+
+import os
+import time
+import asyncio
+from typing import Any, BinaryIO, Dict, List, Set, Tuple
+
+from app.services.gemini_client import run_gemini_summary
+from app.services.pdf_cache import pdf_cache
+from app.services.executors import run_pdf_render
+from app.services.report_builder import render_report_pdf
+from app.services.session_aggregates import aggregate_answers, overall_scores, session_aggregates
+from app.services.session_store import load_session, session_version, update_session
+
+# Session field holding the memoized AI summary
+SUMMARY_FIELD = "ai_summary_cache"
+# Session field describing the precomputed report artifacts
+REPORT_FIELD = "report_cache"
+
+# One in-flight summary computation per (session, version)
+_summaries_in_flight: Dict[Tuple[str, ...], "asyncio.Task"] = {}
+# One in-flight report precomputation per (session, version)
+_reports_in_flight: Dict[Tuple[str, ...], "asyncio.Task"] = {}
+# One in-flight PDF render per (session, version, template)
+_pdfs_in_flight: Dict[Tuple[str, ...], "asyncio.Task"] = {}
+# Strong references to fire-and-forget tasks
+_background: Set["asyncio.Task"] = set()
+
+
+def compute_overall_scores(questions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Overall scores by scanning every answer."""
+    return overall_scores(aggregate_answers(questions))
+
+
+def session_overall_scores(session_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Overall scores from the session's running aggregates (no rescan)."""
+    return overall_scores(session_aggregates(session_data))
+
+
+def _shared(registry: Dict[Tuple[str, ...], "asyncio.Task"], key: Tuple[str, ...], factory) -> "asyncio.Future":
+    task = registry.get(key)
+    if task is None:
+        task = asyncio.create_task(factory())
+        registry[key] = task
+        task.add_done_callback(lambda _: registry.pop(key, None))
+    # shield: one client disconnecting must not cancel the shared work
+    return asyncio.shield(task)
+
+
+async def _compute_summary(session_id: str, session_data: Dict[str, Any], version: str) -> Dict[str, Any]:
+    questions = session_data.get("questions", [])
+    ai_summary = await run_gemini_summary(
+        role=session_data.get("role", "Unknown role"),
+        seniority=session_data.get("seniority", "Unknown level"),
+        questions=questions,
+        overall=session_overall_scores(session_data),
+    )
+
+    # Degraded summaries (circuit open, or an unparsable reply) are
+    # served but not memoized
+    if "summary_mode" not in ai_summary:
+        await asyncio.to_thread(
+            update_session,
+            session_id,
+            {SUMMARY_FIELD: {"version": version, "ai_summary": ai_summary}},
+            version,
+        )
+    return ai_summary
+
+
+async def get_session_summary(session_id: str, session_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    AI summary for a session, memoized in the session itself and keyed by
+    the answers' content hash. Only recomputed when answers change;
+    concurrent requests for the same version share one Gemini call.
+    """
+    version = session_version(session_data)
+
+    cached = session_data.get(SUMMARY_FIELD) or {}
+    if cached.get("version") == version and cached.get("ai_summary"):
+        return cached["ai_summary"]
+
+    return await _shared(
+        _summaries_in_flight,
+        (session_id, version),
+        lambda: _compute_summary(session_id, session_data, version),
+    )
+
+
+# ---------------------------------------------------------------------
+#  PRECOMPUTED REPORTS (overall scores + summary + PDF)
+# ---------------------------------------------------------------------
+
+PDF_TEMPLATES = ("simple", "detailed")
+DEFAULT_PDF_TEMPLATE = "simple"
+
+
+def is_degraded(report: Dict[str, Any]) -> bool:
+    """Reports built on a degraded or fallback summary are never cached."""
+    return "summary_mode" in (report.get("ai_summary") or {})
+
+
+async def _build_pdf(session_id: str, session_data: Dict[str, Any], report: Dict[str, Any], template: str) -> str:
+    key = pdf_cache.key(session_id, report["version"], template)
+    tmp_path = pdf_cache.temp_path(key)
+    # reportlab is pure-Python CPU work: render in the PDF worker pool
+    await run_pdf_render(render_report_pdf, session_id, session_data, report, template, tmp_path)
+
+    if is_degraded(report):
+        return tmp_path  # served once, not cached; caller removes it
+    return pdf_cache.commit(key, tmp_path)
+
+
+async def _build_report(session_id: str, session_data: Dict[str, Any], version: str) -> Dict[str, Any]:
+    report = {
+        "version": version,
+        "overall": session_overall_scores(session_data),
+        "ai_summary": await get_session_summary(session_id, session_data),
+        "generated_at": time.time(),
+    }
+
+    if not is_degraded(report):
+        await asyncio.to_thread(update_session, session_id, {REPORT_FIELD: report}, version)
+    return report
+
+
+async def get_report_artifacts(session_id: str, session_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Overall scores and AI summary for the session's current answers.
+    Served from the session's report_cache when it is up to date;
+    otherwise joins the in-flight precomputation (started by
+    /api/interview/end) or starts one.
+    """
+    version = session_version(session_data)
+
+    cached = session_data.get(REPORT_FIELD) or {}
+    if cached.get("version") == version:
+        return cached
+
+    return await _shared(
+        _reports_in_flight,
+        (session_id, version),
+        lambda: _build_report(session_id, session_data, version),
+    )
+
+
+async def get_report_pdf(session_id: str, session_data: Dict[str, Any], template: str = DEFAULT_PDF_TEMPLATE) -> Tuple[Dict[str, Any], BinaryIO]:
+    """
+    Returns (report, pdf_file) for the session's current answers, from
+    the PDF cache when possible. The PDF is returned open, so a cache
+    eviction while it is being sent cannot remove it from under the
+    caller, who must close it.
+    """
+    report = await get_report_artifacts(session_id, session_data)
+
+    if is_degraded(report):
+        # One-off render per request, never shared or cached: unlinked as
+        # soon as it is open
+        tmp_path = await _build_pdf(session_id, session_data, report, template)
+        f = open(tmp_path, "rb")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return report, f
+
+    key = pdf_cache.key(session_id, report["version"], template)
+    f = pdf_cache.open(key)
+    for _ in range(2):
+        if f is not None:
+            return report, f
+        # Not cached, or evicted between rendering and opening: render
+        await _shared(
+            _pdfs_in_flight,
+            (session_id, report["version"], template),
+            lambda: _build_pdf(session_id, session_data, report, template),
+        )
+        f = pdf_cache.open(key)
+    if f is None:
+        raise RuntimeError(f"PDF for {session_id} was evicted before it could be served")
+    return report, f
+
+
+def start_report_precompute(session_id: str) -> None:
+    """
+    Fire-and-forget report precomputation, used when an interview ends so
+    the report (and its default PDF) is ready before the user opens it.
+    """
+    async def run():
+        try:
+            session_data = await asyncio.to_thread(load_session, session_id)
+            if session_data is None:
+                return
+            _, pdf_file = await get_report_pdf(session_id, session_data)
+            pdf_file.close()
+        except Exception as e:
+            print("Report precompute failed:", session_id, e)
+
+    task = asyncio.create_task(run())
+    _background.add(task)
+    task.add_done_callback(_background.discard)
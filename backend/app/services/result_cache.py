@@ -0,0 +1,59 @@
+# backend/app/services/result_cache.py
+
+import json
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.services.file_cache import FileCache
+
+
+class ResultCache(FileCache):
+    """
+    Transcripts and emotion-analysis results keyed by the uploaded video's
+    content hash, so a retried upload of the same bytes skips the work.
+
+    Keys are "{kind}-{content_hash}-{config_version}": changing the model
+    or the analysis settings changes the version and simply misses. Only
+    successful (non-fallback) results are stored.
+    """
+
+    suffix = ".json"
+
+    def __init__(self, directory: str, max_bytes: int):
+        super().__init__(directory, max_bytes)
+        self.kind_hits: Dict[str, int] = {}
+        self.kind_misses: Dict[str, int] = {}
+
+    @staticmethod
+    def key(kind: str, content_hash: str, config_version: str) -> str:
+        return f"{kind}-{content_hash}-{config_version}"
+
+    def get_result(self, kind: str, content_hash: Optional[str], config_version: str) -> Optional[Any]:
+        if not content_hash:
+            return None
+        path = self.get(self.key(kind, content_hash, config_version))
+        counts = self.kind_misses if path is None else self.kind_hits
+        counts[kind] = counts.get(kind, 0) + 1
+        if path is None:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None  # evicted or replaced meanwhile
+
+    def put_result(self, kind: str, content_hash: Optional[str], config_version: str, value: Any) -> None:
+        if not content_hash:
+            return
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        self.put(self.key(kind, content_hash, config_version), data)
+
+    def stats(self) -> Dict[str, Any]:
+        by_kind = {}
+        for kind in sorted(set(self.kind_hits) | set(self.kind_misses)):
+            hits, misses = self.kind_hits.get(kind, 0), self.kind_misses.get(kind, 0)
+            by_kind[kind] = {"hits": hits, "misses": misses, "hit_rate": round(hits / (hits + misses), 3)}
+        return {**super().stats(), "by_kind": by_kind}
+
+
+result_cache = ResultCache(settings.RESULT_CACHE_DIR, settings.RESULT_CACHE_MAX_BYTES)
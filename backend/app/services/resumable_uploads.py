@@ -0,0 +1,260 @@
+# backend/app/services/resumable_uploads.py
+#
+# Resumable, chunked answer uploads. An upload lives next to the answer
+# videos until it is finalized:
+#   uploads/{session_id}/.{upload_id}.part   bytes received so far
+#   uploads/{session_id}/.{upload_id}.json   question details
+# The .part file's size is the upload offset, so an interrupted client
+# asks for the status and re-sends from there. Finalizing renames the
+# .part file onto the answer's video path (no copy). Uploads left
+# untouched for RESUMABLE_UPLOAD_TTL_S are deleted.
+
+import os
+import re
+import json
+import time
+import uuid
+import asyncio
+import hashlib
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+try:
+    import fcntl  # POSIX only; without it appends are not serialised across processes
+except ImportError:
+    fcntl = None
+
+from app.core.config import settings
+from app.services.uploads import SavedUpload, UploadTooLargeError
+
+_UPLOAD_ID = re.compile(r"^[0-9a-f]{32}$")
+# Abandoned uploads are looked for at most this often (from create())
+_SWEEP_INTERVAL_S = 600.0
+
+
+class UploadNotFoundError(Exception):
+    pass
+
+
+class UploadBusyError(Exception):
+    """Another request is appending to or finalizing the same upload."""
+
+
+class UploadOffsetError(Exception):
+    def __init__(self, offset: int, message: str):
+        super().__init__(message)
+        self.offset = offset
+
+
+class ResumableUploads:
+    def __init__(self, directory: str, ttl_s: float = 24 * 3600):
+        self.directory = directory
+        self.ttl_s = ttl_s
+        self._last_sweep = 0.0
+        # upload_id → (running sha256, bytes it covers). Kept only while the
+        # chunks arrive in order at this process; otherwise finalize re-reads
+        # the file to hash it.
+        self._digests: Dict[str, Tuple[Any, int]] = {}
+
+    def _paths(self, session_id: str, upload_id: str) -> Tuple[str, str]:
+        if not _UPLOAD_ID.match(upload_id) or session_id != os.path.basename(session_id):
+            raise UploadNotFoundError(upload_id)
+        base = os.path.join(self.directory, session_id, f".{upload_id}")
+        return f"{base}.part", f"{base}.json"
+
+    def _meta(self, session_id: str, upload_id: str) -> Dict[str, Any]:
+        _, meta_path = self._paths(session_id, upload_id)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise UploadNotFoundError(upload_id)
+
+    def _open_locked(self, part_path: str, upload_id: str) -> int:
+        try:
+            fd = os.open(part_path, os.O_RDWR)
+        except FileNotFoundError:
+            raise UploadNotFoundError(upload_id)
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                raise UploadBusyError(upload_id)
+        return fd
+
+    # ------------------------------------------------------------------
+    #  PROTOCOL
+    # ------------------------------------------------------------------
+
+    def create(self, session_id: str, question_id: str, question_text: str, size: Optional[int] = None) -> Dict[str, Any]:
+        """Starts an upload; `size` (total bytes) is optional but checked at finalize."""
+        now = time.time()
+        if now - self._last_sweep >= min(_SWEEP_INTERVAL_S, self.ttl_s):
+            self._last_sweep = now
+            self.expire()
+
+        if size is not None and size > settings.MAX_ANSWER_UPLOAD_BYTES:
+            raise UploadTooLargeError(settings.MAX_ANSWER_UPLOAD_BYTES)
+
+        upload_id = uuid.uuid4().hex
+        part_path, meta_path = self._paths(session_id, upload_id)
+        os.makedirs(os.path.dirname(part_path), exist_ok=True)
+
+        meta = {
+            "upload_id": upload_id,
+            "session_id": session_id,
+            "question_id": question_id,
+            "question_text": question_text,
+            "size": size,
+            "created_at": time.time(),
+        }
+        tmp_path = f"{meta_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+        open(part_path, "wb").close()
+
+        self._digests[upload_id] = (hashlib.sha256(), 0)
+        return {**meta, "offset": 0}
+
+    def status(self, session_id: str, upload_id: str) -> Dict[str, Any]:
+        meta = self._meta(session_id, upload_id)
+        part_path, _ = self._paths(session_id, upload_id)
+        try:
+            offset = os.path.getsize(part_path)
+        except FileNotFoundError:
+            raise UploadNotFoundError(upload_id)
+        return {**meta, "offset": offset}
+
+    async def append(self, session_id: str, upload_id: str, offset: int, chunks: AsyncIterator[bytes]) -> int:
+        """
+        Writes a chunk that starts at `offset`, which must equal the bytes
+        received so far. Returns the new offset. If the connection drops
+        mid-chunk, the bytes that arrived are kept and the status reports
+        where to resume.
+        """
+        meta = self._meta(session_id, upload_id)
+        part_path, _ = self._paths(session_id, upload_id)
+        limit = meta.get("size") or settings.MAX_ANSWER_UPLOAD_BYTES
+
+        fd = self._open_locked(part_path, upload_id)
+        try:
+            current = os.fstat(fd).st_size
+            if offset != current:
+                raise UploadOffsetError(current, f"Expected offset {current}, got {offset}")
+
+            digest, hashed = self._digests.get(upload_id, (None, -1))
+            if hashed != current:
+                digest = None
+                self._digests.pop(upload_id, None)
+
+            written = current
+            try:
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    if written + len(chunk) > limit:
+                        raise UploadTooLargeError(limit)
+                    await asyncio.to_thread(os.pwrite, fd, chunk, written)
+                    written += len(chunk)
+                    if digest is not None:
+                        digest.update(chunk)
+                        self._digests[upload_id] = (digest, written)
+            except UploadTooLargeError:
+                # Reject the whole chunk so the client can retry it smaller
+                os.ftruncate(fd, current)
+                self._digests.pop(upload_id, None)
+                raise
+            return written
+        finally:
+            os.close(fd)
+
+    async def finalize(self, session_id: str, upload_id: str, dest_path: str) -> Tuple[Dict[str, Any], SavedUpload]:
+        """
+        Renames the completed upload to `dest_path` and returns its
+        details with the size and sha256 of the content.
+        """
+        meta = self._meta(session_id, upload_id)
+        part_path, meta_path = self._paths(session_id, upload_id)
+
+        fd = self._open_locked(part_path, upload_id)
+        try:
+            size = os.fstat(fd).st_size
+            if meta.get("size") is not None and size != meta["size"]:
+                raise UploadOffsetError(size, f"Upload incomplete: {size} of {meta['size']} bytes received")
+
+            digest, hashed = self._digests.pop(upload_id, (None, -1))
+            if hashed == size:
+                content_hash = digest.hexdigest()
+            else:
+                content_hash = await asyncio.to_thread(_hash_fd, fd)
+
+            os.replace(part_path, dest_path)
+        finally:
+            os.close(fd)
+
+        try:
+            os.remove(meta_path)
+        except FileNotFoundError:
+            pass
+        return meta, SavedUpload(dest_path, size, content_hash)
+
+    def expire(self) -> int:
+        """
+        Deletes uploads with no activity (create or append) for `ttl_s`,
+        and forgets hash state for uploads that are gone. Returns the
+        number deleted.
+        """
+        cutoff = time.time() - self.ttl_s
+        live = set()
+        expired = 0
+        try:
+            session_dirs = [entry.path for entry in os.scandir(self.directory) if entry.is_dir()]
+        except FileNotFoundError:
+            return 0
+
+        for session_dir in session_dirs:
+            for entry in os.scandir(session_dir):
+                if not (entry.name.startswith(".") and entry.name.endswith(".json")):
+                    continue
+                upload_id = entry.name[1:-len(".json")]
+                part_path = os.path.join(session_dir, f".{upload_id}.part")
+                try:
+                    last_active = max(entry.stat().st_mtime, os.path.getmtime(part_path))
+                except FileNotFoundError:
+                    last_active = 0.0  # finalized meanwhile, or half-created
+                if last_active >= cutoff:
+                    live.add(upload_id)
+                    continue
+                for path in (part_path, entry.path):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                expired += 1
+
+        for upload_id in list(self._digests):
+            if upload_id not in live:
+                self._digests.pop(upload_id, None)
+        return expired
+
+    def abort(self, session_id: str, upload_id: str) -> None:
+        part_path, meta_path = self._paths(session_id, upload_id)
+        self._meta(session_id, upload_id)
+        self._digests.pop(upload_id, None)
+        for path in (part_path, meta_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+def _hash_fd(fd: int) -> str:
+    digest = hashlib.sha256()
+    position = 0
+    while True:
+        chunk = os.pread(fd, settings.UPLOAD_CHUNK_BYTES, position)
+        if not chunk:
+            return digest.hexdigest()
+        digest.update(chunk)
+        position += len(chunk)
@@ -6,16 +6,8 @@ import os
 from typing import Dict, Any
 
 from PyPDF2 import PdfReader
-import google.generativeai as genai
 
-from app.core.config import settings
-
-
-# Configure Gemini once
-if not settings.GEMINI_API_KEY:
-    raise ValueError("GEMINI_API_KEY is not set in environment/.env")
-
-genai.configure(api_key=settings.GEMINI_API_KEY)
+from app.services.llm_client import MODEL_FLASH_LITE, generate_text
 
 
 def extract_text_from_pdf(file_path: str) -> str:
@@ -43,7 +35,7 @@ def extract_text_from_pdf(file_path: str) -> str:
     return full_text
 
 
-def extract_structured_profile(resume_text: str) -> Dict[str, Any]:
+async def extract_structured_profile(resume_text: str) -> Dict[str, Any]:
     """
     Use Gemini to turn the raw resume text into a structured profile.
 
@@ -86,12 +78,7 @@ def extract_structured_profile(resume_text: str) -> Dict[str, Any]:
     {resume_text}
     """
 
-    model = genai.GenerativeModel("gemini-2.5-flash-lite")
-
-
-    response = model.generate_content(prompt)
-
-    raw_text = (response.text or "").strip()
+    raw_text = await generate_text(prompt, model_name=MODEL_FLASH_LITE, site="resume")
 
     # Try to parse JSON safely
     import json
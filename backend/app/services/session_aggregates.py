@@ -0,0 +1,135 @@
+# backend/app/services/session_aggregates.py
+#
+# Running per-session aggregates, stored with the session as "aggregates"
+# and updated in O(1) each time an answer is appended:
+#
+#   answers          number of answers folded in
+#   score_sums       per-dimension score sums
+#   dominant_counts  answers per dominant emotion
+#   emotion_sums     emotion probabilities weighted by face frames
+#   emotion_frames   total weight behind emotion_sums
+#   frames_analyzed  sampled frames across all answers
+#
+# Sums and counts (never averages) are kept so aggregates from several
+# sessions can be merged exactly for cohort statistics.
+
+from typing import Any, Dict, Iterable, Optional
+
+SCORE_FIELDS = ("content_score", "structure_score", "clarity_score", "confidence_score")
+
+
+def _score(answer: Dict[str, Any], field: str) -> float:
+    # Missing or unparsable scores count as 0, as in the original report
+    try:
+        return float(answer.get(field, 0) or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def empty_aggregates() -> Dict[str, Any]:
+    return {
+        "answers": 0,
+        "score_sums": {field: 0.0 for field in SCORE_FIELDS},
+        "dominant_counts": {},
+        "emotion_sums": {},
+        "emotion_frames": 0,
+        "frames_analyzed": 0,
+    }
+
+
+def add_answer(aggregates: Optional[Dict[str, Any]], answer: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns new aggregates with `answer` folded in (the input is not modified)."""
+    base = aggregates or empty_aggregates()
+    result = {
+        "answers": base["answers"] + 1,
+        "score_sums": {
+            field: base["score_sums"].get(field, 0.0) + _score(answer, field)
+            for field in SCORE_FIELDS
+        },
+        "dominant_counts": dict(base["dominant_counts"]),
+        "emotion_sums": dict(base["emotion_sums"]),
+        "emotion_frames": base["emotion_frames"],
+        "frames_analyzed": base["frames_analyzed"],
+    }
+
+    expression = answer.get("expression") or {}
+    dominant = expression.get("dominant_emotion")
+    if dominant:
+        result["dominant_counts"][dominant] = result["dominant_counts"].get(dominant, 0) + 1
+
+    emotion_scores = expression.get("emotion_scores") or {}
+    if emotion_scores:
+        # Results from before face_frames was reported count as one sample
+        weight = int(expression.get("face_frames") or 1)
+        for label, score in emotion_scores.items():
+            result["emotion_sums"][label] = result["emotion_sums"].get(label, 0.0) + float(score) * weight
+        result["emotion_frames"] += weight
+    result["frames_analyzed"] += int(expression.get("frames_analyzed") or 0)
+
+    return result
+
+
+def aggregate_answers(answers: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregates from scratch (sessions stored before aggregates existed)."""
+    aggregates = empty_aggregates()
+    for answer in answers:
+        aggregates = add_answer(aggregates, answer)
+    return aggregates
+
+
+def merge_aggregates(*parts: Dict[str, Any]) -> Dict[str, Any]:
+    """Combines aggregates of several sessions, e.g. a role/seniority cohort."""
+    merged = empty_aggregates()
+    for part in parts:
+        merged["answers"] += part["answers"]
+        for field in SCORE_FIELDS:
+            merged["score_sums"][field] += part["score_sums"].get(field, 0.0)
+        for label, count in part["dominant_counts"].items():
+            merged["dominant_counts"][label] = merged["dominant_counts"].get(label, 0) + count
+        for label, total in part["emotion_sums"].items():
+            merged["emotion_sums"][label] = merged["emotion_sums"].get(label, 0.0) + total
+        merged["emotion_frames"] += part["emotion_frames"]
+        merged["frames_analyzed"] += part["frames_analyzed"]
+    return merged
+
+
+def session_aggregates(session_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The session's stored aggregates when they cover all of its answers,
+    otherwise a full recomputation.
+    """
+    questions = session_data.get("questions", [])
+    aggregates = session_data.get("aggregates")
+    if aggregates and aggregates.get("answers") == len(questions):
+        return aggregates
+    return aggregate_answers(questions)
+
+
+def overall_scores(aggregates: Dict[str, Any]) -> Dict[str, Any]:
+    """The report's "overall" block from aggregates."""
+    n = aggregates["answers"]
+    dominant_counts = aggregates["dominant_counts"]
+
+    dominant_emotion = "unknown"
+    if dominant_counts:
+        dominant_emotion = max(dominant_counts, key=dominant_counts.get)
+
+    frames = aggregates["emotion_frames"]
+    emotion_scores = {
+        label: round(total / frames, 4) for label, total in aggregates["emotion_sums"].items()
+    } if frames else {}
+
+    return {
+        **{
+            field: round(aggregates["score_sums"][field] / n, 2) if n else 0
+            for field in SCORE_FIELDS
+        },
+        "emotion_summary": {
+            "dominant_emotion": dominant_emotion,
+            "emotion_counts": dominant_counts,
+            # Frame-weighted over every answer, not just the per-answer winners
+            "emotion_scores": emotion_scores,
+            "face_frames": frames,
+            "frames_analyzed": aggregates["frames_analyzed"],
+        },
+    }
@@ -0,0 +1,180 @@
+# backend/app/services/session_cache.py
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional
+
+from app.services.session_aggregates import add_answer, session_aggregates
+from app.services.session_repository import SessionRepository, next_version, session_version
+
+
+class _Entry(NamedTuple):
+    session_data: Dict[str, Any]
+    stamp: Hashable
+    size: int
+
+
+def _estimate_size(value: Any) -> int:
+    # Serialised size: close enough to track the budget, and cheaper
+    # than walking the object graph with sys.getsizeof
+    return len(json.dumps(value, ensure_ascii=False))
+
+
+class CachedSessionRepository(SessionRepository):
+    """
+    Bounded LRU cache of parsed sessions in front of another repository.
+
+    Each entry remembers the backend's change stamp for the session, and
+    every read re-checks it (a stat or a single-row query), so writes made
+    by other worker processes are picked up. Writes through this cache go
+    to the backend first and then replace the cached entry.
+
+    Cached session dicts are shared between callers and must be treated
+    as read-only; writes build new dicts rather than mutating them.
+    """
+
+    def __init__(self, backend: SessionRepository, max_bytes: int):
+        self.backend = backend
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    # ------------------------------------------------------------------
+    #  ENTRIES
+    # ------------------------------------------------------------------
+
+    def _put(self, session_id: str, session_data: Dict[str, Any], stamp: Hashable, size: Optional[int] = None) -> None:
+        if size is None:
+            size = _estimate_size(session_data)
+        with self._lock:
+            self._drop(session_id)
+            if size > self.max_bytes:
+                return  # larger than the whole cache: not worth holding
+            self._entries[session_id] = _Entry(session_data, stamp, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.evictions += 1
+
+    def _drop(self, session_id: str) -> Optional[_Entry]:
+        entry = self._entries.pop(session_id, None)
+        if entry is not None:
+            self._bytes -= entry.size
+        return entry
+
+    def invalidate(self, session_id: str) -> None:
+        with self._lock:
+            self._drop(session_id)
+
+    # ------------------------------------------------------------------
+    #  REPOSITORY
+    # ------------------------------------------------------------------
+
+    def change_stamp(self, session_id: str) -> Optional[Hashable]:
+        return self.backend.change_stamp(session_id)
+
+    def create(self, session_data: Dict[str, Any]) -> None:
+        self.backend.create(session_data)
+        self.invalidate(session_data["session_id"])
+
+    def exists(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id in self._entries:
+                return True
+        return self.backend.exists(session_id)
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        stamp = self.backend.change_stamp(session_id)
+        if stamp is None:
+            self.invalidate(session_id)
+            return None
+
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is not None and entry.stamp == stamp:
+                self._entries.move_to_end(session_id)
+                self.hits += 1
+                return entry.session_data
+            if entry is not None:
+                self.stale += 1
+            self.misses += 1
+
+        session_data = self.backend.load(session_id)
+        if session_data is None:
+            self.invalidate(session_id)
+            return None
+        # A write landing between the stamp and the load only makes the
+        # entry look stale next time, never the other way round
+        self._put(session_id, session_data, stamp)
+        return session_data
+
+    def peek_version(self, session_id: str) -> Optional[str]:
+        return self.backend.peek_version(session_id)
+
+    def append_answer(self, session_id: str, answer: Dict[str, Any]) -> str:
+        with self._lock:
+            entry = self._entries.get(session_id)
+
+        version = self.backend.append_answer(session_id, answer)
+
+        # Only extend the cached copy if it was current when we appended
+        if entry is not None and next_version(session_version(entry.session_data), answer) == version:
+            cached = entry.session_data
+            session_data = {
+                **cached,
+                "questions": cached.get("questions", []) + [answer],
+                "version": version,
+                "aggregates": add_answer(session_aggregates(cached), answer),
+            }
+            size = entry.size + _estimate_size(answer)
+            self._write_through(session_id, entry, session_data, size)
+        else:
+            self.invalidate(session_id)
+        return version
+
+    def update_fields(self, session_id: str, fields: Dict[str, Any], expected_version: Optional[str] = None) -> bool:
+        with self._lock:
+            entry = self._entries.get(session_id)
+        if entry is not None and entry.stamp != self.backend.change_stamp(session_id):
+            entry = None  # changed elsewhere; nothing to build on
+
+        updated = self.backend.update_fields(session_id, fields, expected_version)
+
+        if not updated or entry is None:
+            self.invalidate(session_id)
+        else:
+            self._write_through(session_id, entry, {**entry.session_data, **fields})
+        return updated
+
+    def _write_through(self, session_id: str, before: _Entry, session_data: Dict[str, Any], size: Optional[int] = None) -> None:
+        # Another process writing between our write and this stamp would
+        # go unnoticed until its next write; the window is one stat/query
+        stamp = self.backend.change_stamp(session_id)
+        with self._lock:
+            if self._entries.get(session_id) is not before:
+                # Reloaded or rewritten concurrently: let the next read decide
+                self._drop(session_id)
+                return
+        self._put(session_id, session_data, stamp, size)
+
+    def list_ids(self) -> List[str]:
+        return self.backend.list_ids()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "evictions": self.evictions,
+        }
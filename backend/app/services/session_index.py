@@ -0,0 +1,234 @@
+# backend/app/services/session_index.py
+#
+# Search index over sessions for /api/sessions and bulk export. One row
+# per session with the filterable fields and running score sums; rows are
+# updated in place as sessions are created, answered and ended, so
+# listing never needs to open the sessions themselves.
+
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.models.db_models import INDEX_SCHEMA
+from app.services.db import WriteTransaction, connect
+
+SCORE_FIELDS = ("content_score", "structure_score", "clarity_score", "confidence_score")
+_SUM_COLUMNS = ("content_sum", "structure_sum", "clarity_sum", "confidence_sum")
+
+# Mean of the four per-dimension averages, as shown in the report
+_OVERALL_SQL = (
+    "CASE WHEN answer_count > 0 THEN "
+    "(content_sum + structure_sum + clarity_sum + confidence_sum) / (4.0 * answer_count) END"
+)
+
+MAX_PAGE_SIZE = 200
+
+
+def _score(answer: Dict[str, Any], field: str) -> float:
+    # Same coercion as compute_overall_scores: missing/invalid counts as 0
+    try:
+        return float(answer.get(field, 0) or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _key(value: Optional[str]) -> str:
+    return (value or "").strip().lower()
+
+
+def encode_cursor(created_at: float, session_id: str) -> str:
+    return f"{created_at!r}_{session_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    created_at, _, session_id = cursor.partition("_")
+    return float(created_at), session_id
+
+
+class SessionIndex:
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        with self._write() as conn:
+            for statement in INDEX_SCHEMA:
+                conn.execute(statement)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def _write(self) -> WriteTransaction:
+        return WriteTransaction(self._connect())
+
+    # ------------------------------------------------------------------
+    #  MAINTENANCE
+    # ------------------------------------------------------------------
+
+    def add_session(self, session_data: Dict[str, Any], conn=None) -> None:
+        """Indexes (or re-indexes) a whole session."""
+        questions = session_data.get("questions", [])
+        sums = [sum(_score(q, field) for q in questions) for field in SCORE_FIELDS]
+        row = (
+            session_data["session_id"],
+            session_data.get("role", ""),
+            session_data.get("seniority", ""),
+            _key(session_data.get("role")),
+            _key(session_data.get("seniority")),
+            session_data.get("created_at") or 0.0,
+            session_data.get("status"),
+            len(questions),
+            *sums,
+        )
+        sql = f"""
+            INSERT OR REPLACE INTO session_index
+                (session_id, role, seniority, role_key, seniority_key, created_at, status,
+                 answer_count, {", ".join(_SUM_COLUMNS)}, overall_score)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)
+        """
+        update = f"UPDATE session_index SET overall_score = {_OVERALL_SQL} WHERE session_id = ?"
+
+        if conn is not None:
+            conn.execute(sql, row)
+            conn.execute(update, (row[0],))
+            return
+        with self._write() as conn:
+            conn.execute(sql, row)
+            conn.execute(update, (row[0],))
+
+    def record_answer(self, session_id: str, answer: Dict[str, Any]) -> bool:
+        """
+        Adds one answer's scores to the session's running sums. Returns
+        False if the session is not indexed yet.
+        """
+        increments = ", ".join(f"{col} = {col} + ?" for col in _SUM_COLUMNS)
+        with self._write() as conn:
+            cursor = conn.execute(
+                f"UPDATE session_index SET answer_count = answer_count + 1, {increments} WHERE session_id = ?",
+                (*(_score(answer, field) for field in SCORE_FIELDS), session_id),
+            )
+            if cursor.rowcount == 0:
+                return False
+            conn.execute(f"UPDATE session_index SET overall_score = {_OVERALL_SQL} WHERE session_id = ?", (session_id,))
+        return True
+
+    def set_status(self, session_id: str, status: Optional[str]) -> None:
+        with self._write() as conn:
+            conn.execute("UPDATE session_index SET status = ? WHERE session_id = ?", (status, session_id))
+
+    def rebuild(self, sessions: Iterable[Dict[str, Any]]) -> int:
+        """Replaces the whole index (python -m app.cli reindex)."""
+        count = 0
+        with self._write() as conn:
+            conn.execute("DELETE FROM session_index")
+            for session_data in sessions:
+                self.add_session(session_data, conn=conn)
+                count += 1
+        return count
+
+    # ------------------------------------------------------------------
+    #  QUERIES
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _where(
+        role: Optional[str] = None,
+        seniority: Optional[str] = None,
+        created_from: Optional[float] = None,
+        created_to: Optional[float] = None,
+        min_score: Optional[float] = None,
+        max_score: Optional[float] = None,
+        status: Optional[str] = None,
+    ) -> Tuple[List[str], List[Any]]:
+        clauses, params = [], []
+        if role:
+            clauses.append("role_key = ?")
+            params.append(_key(role))
+        if seniority:
+            clauses.append("seniority_key = ?")
+            params.append(_key(seniority))
+        if created_from is not None:
+            clauses.append("created_at >= ?")
+            params.append(created_from)
+        if created_to is not None:
+            clauses.append("created_at < ?")
+            params.append(created_to)
+        if min_score is not None:
+            clauses.append("overall_score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append("overall_score <= ?")
+            params.append(max_score)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        return clauses, params
+
+    def search(self, limit: int = 50, cursor: Optional[str] = None, **filters: Any) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Newest-first page of sessions matching the filters, and the cursor
+        for the next page (None on the last page). Keyset pagination on
+        (created_at, session_id), so deep pages cost the same as the first.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        clauses, params = self._where(**filters)
+        if cursor:
+            created_at, session_id = decode_cursor(cursor)
+            clauses.append("(created_at < ? OR (created_at = ? AND session_id < ?))")
+            params.extend([created_at, created_at, session_id])
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connect().execute(
+            f"""
+            SELECT session_id, role, seniority, created_at, status, answer_count,
+                   {", ".join(_SUM_COLUMNS)}, overall_score
+            FROM session_index {where}
+            ORDER BY created_at DESC, session_id DESC
+            LIMIT ?
+            """,
+            (*params, limit + 1),
+        ).fetchall()
+
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1]
+            next_cursor = encode_cursor(last["created_at"], last["session_id"])
+        return [self._summary(row) for row in page], next_cursor
+
+    @staticmethod
+    def _summary(row) -> Dict[str, Any]:
+        n = row["answer_count"]
+        scores = {
+            field: round(row[col] / n, 2) if n else 0
+            for field, col in zip(SCORE_FIELDS, _SUM_COLUMNS)
+        }
+        return {
+            "session_id": row["session_id"],
+            "role": row["role"],
+            "seniority": row["seniority"],
+            "created_at": row["created_at"],
+            "status": row["status"],
+            "answer_count": n,
+            "overall_score": None if row["overall_score"] is None else round(row["overall_score"], 2),
+            "scores": scores,
+        }
+
+    def session_ids(self, **filters: Any) -> List[str]:
+        clauses, params = self._where(**filters)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connect().execute(
+            f"SELECT session_id FROM session_index {where} ORDER BY created_at, session_id", params
+        ).fetchall()
+        return [row["session_id"] for row in rows]
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM session_index").fetchone()[0]
+
+
+session_index = SessionIndex(settings.SESSION_INDEX_PATH)
@@ -0,0 +1,75 @@
+# backend/app/services/session_repository.py
+#
+# Storage interface shared by the session backends (file_store.py,
+# sqlite_store.py, session_cache.py) and the version helpers they use.
+# Kept apart from session_store.py, which builds the configured
+# repository at import time, so the backends can be imported on their own.
+
+import json
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, List, Optional
+
+
+def content_version(questions: List[Dict[str, Any]]) -> str:
+    """Content hash of a list of answers."""
+    payload = json.dumps(questions, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def next_version(version: str, answer: Dict[str, Any]) -> str:
+    """Version after appending `answer`, chained so no full rescan is needed."""
+    payload = version + json.dumps(answer, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def session_version(session_data: Dict[str, Any]) -> str:
+    """
+    Version of the session's answers. Changes whenever an answer is
+    added; derived data (summary, PDF) is keyed by it. Sessions stored
+    without a version fall back to a content hash of their answers.
+    """
+    return session_data.get("version") or content_version(session_data.get("questions", []))
+
+
+class SessionRepository(ABC):
+    """Storage interface for interview sessions."""
+
+    @abstractmethod
+    def create(self, session_data: Dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def exists(self, session_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    def peek_version(self, session_id: str) -> Optional[str]:
+        """Current version without loading the answers (None if missing)."""
+        session_data = self.load(session_id)
+        return None if session_data is None else session_version(session_data)
+
+    @abstractmethod
+    def change_stamp(self, session_id: str) -> Optional[Hashable]:
+        """
+        Cheap token that changes on every write to the session (None if it
+        does not exist); used to keep caches coherent across processes.
+        """
+
+    @abstractmethod
+    def append_answer(self, session_id: str, answer: Dict[str, Any]) -> str:
+        """Appends one answer and returns the new session version."""
+
+    @abstractmethod
+    def update_fields(self, session_id: str, fields: Dict[str, Any], expected_version: Optional[str] = None) -> bool:
+        """
+        Sets top-level fields. With `expected_version`, nothing is written
+        (returns False) if the answers changed in the meantime.
+        """
+
+    @abstractmethod
+    def list_ids(self) -> List[str]:
+        ...
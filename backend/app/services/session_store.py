@@ -0,0 +1,186 @@
+# backend/app/services/session_store.py
+#
+# Session storage behind a small repository interface. Sessions are plain
+# dicts shaped like the original sessions/{id}.json files:
+#   {"session_id", "role", "seniority", "questions": [...], ...}
+# The backend is chosen with SESSION_BACKEND: "sqlite" (sqlite_store.py) or
+# "json" (per-session files with an append-only answer log, file_store.py).
+
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.services.cohort_store import cohort_store
+from app.services.session_aggregates import empty_aggregates
+from app.services.session_index import session_index
+from app.services.session_repository import (  # noqa: F401 (re-exported)
+    SessionRepository,
+    content_version,
+    next_version,
+    session_version,
+)
+
+SESSIONS_DIR = "sessions"
+os.makedirs(SESSIONS_DIR, exist_ok=True)
+
+
+# ---------------------------------------------------------------------
+#  BACKEND SELECTION
+# ---------------------------------------------------------------------
+
+def _make_repository() -> SessionRepository:
+    if settings.SESSION_BACKEND == "json":
+        from app.services.file_store import FileSessionRepository
+        return FileSessionRepository(
+            SESSIONS_DIR,
+            fsync=settings.SESSION_LOG_FSYNC,
+            compact_bytes=settings.SESSION_LOG_COMPACT_BYTES,
+        )
+    if settings.SESSION_BACKEND == "sqlite":
+        from app.services.sqlite_store import SqliteSessionRepository
+        return SqliteSessionRepository(settings.SESSION_DB_PATH)
+    raise ValueError(f"Unknown SESSION_BACKEND: {settings.SESSION_BACKEND!r}")
+
+
+def _with_cache(backend: SessionRepository) -> SessionRepository:
+    if settings.SESSION_CACHE_MAX_BYTES <= 0:
+        return backend
+    from app.services.session_cache import CachedSessionRepository
+    return CachedSessionRepository(backend, settings.SESSION_CACHE_MAX_BYTES)
+
+
+_backend = _make_repository()
+repository: SessionRepository = _with_cache(_backend)
+
+
+def session_exists(session_id: str) -> bool:
+    return repository.exists(session_id)
+
+
+def load_session(session_id: str) -> Optional[Dict[str, Any]]:
+    return repository.load(session_id)
+
+
+def peek_session_version(session_id: str) -> Optional[str]:
+    """
+    Current version of a stored session, read without parsing its
+    answers where the backend allows (None if the session is missing).
+    """
+    return repository.peek_version(session_id)
+
+
+def create_session(session_id: str, role: str, seniority: str) -> Dict[str, Any]:
+    session_data = {
+        "session_id": session_id,
+        "role": role,
+        "seniority": seniority,
+        "created_at": time.time(),
+        "version": content_version([]),
+        "aggregates": empty_aggregates(),
+        "questions": [],
+    }
+    repository.create(session_data)
+    _update_index(session_index.add_session, session_data)
+    return session_data
+
+
+def append_answer(session_id: str, answer: Dict[str, Any]) -> str:
+    """Appends one answer to the session; returns the new version."""
+    version = repository.append_answer(session_id, answer)
+    _update_index(_index_answer, session_id, answer)
+    _update_index(_record_cohort_scores, session_id)
+    return version
+
+
+def update_session(session_id: str, fields: Dict[str, Any], expected_version: Optional[str] = None) -> bool:
+    """
+    Sets top-level fields on a stored session (used for derived data such
+    as the cached AI summary). With `expected_version`, the update is
+    skipped (returns False) if the answers changed in the meantime.
+    """
+    updated = repository.update_fields(session_id, fields, expected_version)
+    if updated and "status" in fields:
+        _update_index(session_index.set_status, session_id, fields["status"])
+    return updated
+
+
+def list_session_ids() -> List[str]:
+    return repository.list_ids()
+
+
+def import_json_sessions() -> int:
+    """
+    On the SQLite backend, imports sessions/{id}.json files that are not in
+    the database yet (sessions stored before the switch), so upgrading
+    does not hide them. Runs at startup; once imported, files are skipped
+    without being parsed. Returns the number imported.
+    """
+    if settings.SESSION_BACKEND != "sqlite":
+        return 0
+    from app.services.sqlite_store import iter_json_sessions
+
+    known = set(_backend.list_ids())
+    imported = 0
+    for session_data in iter_json_sessions(SESSIONS_DIR, skip=known.__contains__):
+        # Another worker may be importing too; only the first insert counts
+        if _backend.import_session(session_data):
+            _update_index(session_index.add_session, session_data)
+            _update_index(cohort_store.record, session_data)
+            imported += 1
+    return imported
+
+
+def backfill_index() -> int:
+    """
+    Indexes stored sessions missing from the session index (created
+    before it existed, or while index updates failed), so listings and
+    role/seniority exports include them without a manual
+    `python -m app.cli reindex`. Runs at startup; returns the number added.
+    """
+    stored = _backend.list_ids()
+    if session_index.count() >= len(stored):
+        return 0
+
+    indexed = set(session_index.session_ids())
+    added = 0
+    for session_id in stored:
+        if session_id in indexed:
+            continue
+        # From the backend directly: no point filling the LRU with old sessions
+        session_data = _backend.load(session_id)
+        if session_data is None:
+            continue
+        _update_index(session_index.add_session, session_data)
+        _update_index(cohort_store.record, session_data)
+        added += 1
+    return added
+
+
+def _index_answer(session_id: str, answer: Dict[str, Any]) -> None:
+    if not session_index.record_answer(session_id, answer):
+        # Created before the index existed: index it whole once
+        session_data = repository.load(session_id)
+        if session_data is not None:
+            session_index.add_session(session_data)
+
+
+def _record_cohort_scores(session_id: str) -> None:
+    # Served from the session cache right after the write-through
+    session_data = repository.load(session_id)
+    if session_data is not None:
+        cohort_store.record(session_data)
+
+
+def _update_index(fn, *args: Any) -> None:
+    # The session itself is already stored; a failed index update only
+    # affects listings and cohorts until `python -m app.cli reindex`
+    try:
+        fn(*args)
+    except Exception as e:
+        print("Session index update failed:", e)
+
+
+def cache_stats() -> Optional[Dict[str, int]]:
+    stats = getattr(repository, "stats", None)
+    return stats() if stats else None
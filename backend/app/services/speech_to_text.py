@@ -1,21 +1,13 @@
 # backend/app/services/speech_to_text.py
 
 import os
+import asyncio
 from typing import Literal
 
-import google.generativeai as genai
-from dotenv import load_dotenv
-
-# Load environment variables (GEMINI_API_KEY)
-load_dotenv()
-API_KEY = os.getenv("GEMINI_API_KEY")
-
-if not API_KEY:
-    raise ValueError("GEMINI_API_KEY not found in environment. Please set it in your .env file.")
-
-# Configure Gemini
-genai.configure(api_key=API_KEY)
+from app.services.llm_client import MODEL_FLASH_LITE, generate_text
 
+# Part of the transcript cache key: bump when the prompt below changes
+TRANSCRIPTION_VERSION = f"{MODEL_FLASH_LITE}.1"
 
 # Supported audio mime types (extend if needed)
 AudioMimeType = Literal[
@@ -48,7 +40,12 @@ def guess_mime_type(file_path: str) -> AudioMimeType:
     return "audio/wav"  # safe default if you're mainly using wav
 
 
-def transcribe_audio_file(file_path: str) -> str:
+def _read_bytes(file_path: str) -> bytes:
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+async def transcribe_audio_file(file_path: str) -> str:
     """
     Transcribe an audio file using Gemini.
 
@@ -60,15 +57,11 @@ def transcribe_audio_file(file_path: str) -> str:
 
     mime_type = guess_mime_type(file_path)
 
-    # Read bytes
-    with open(file_path, "rb") as f:
-        audio_bytes = f.read()
-
-    # Build Gemini model
-    model = genai.GenerativeModel("gemini-2.5-flash-lite")
+    # Read bytes (off the event loop)
+    audio_bytes = await asyncio.to_thread(_read_bytes, file_path)
 
     try:
-        response = model.generate_content(
+        transcript = await generate_text(
             [
                 "You are a transcription engine. Transcribe the following audio accurately. "
                 "Only return the raw transcript, no extra commentary.",
@@ -76,22 +69,22 @@ def transcribe_audio_file(file_path: str) -> str:
                     "mime_type": mime_type,
                     "data": audio_bytes,
                 },
-            ]
+            ],
+            model_name=MODEL_FLASH_LITE,
+            site="transcription",
         )
     except Exception as e:
         raise RuntimeError(f"Gemini transcription failed: {e}")
 
-    transcript = (response.text or "").strip()
-
     if not transcript:
         raise RuntimeError("Gemini returned an empty transcript.")
 
     return transcript
 
 
-def transcribe_video_file(file_path: str) -> str:
+async def transcribe_video_file(file_path: str) -> str:
     """
     Thin wrapper so other code can call transcribe_video_file().
     We treat the video (e.g., .webm) as an audio container and reuse the same logic.
     """
-    return transcribe_audio_file(file_path)
+    return await transcribe_audio_file(file_path)
@@ -0,0 +1,311 @@
+# backend/app/services/sqlite_store.py
+#
+# SQLite session repository (SESSION_BACKEND=sqlite). One database file in
+# WAL mode: readers never block the writer, and appending an answer is a
+# single-row insert instead of rewriting the whole session document.
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from app.models.db_models import MIGRATIONS, SCHEMA, SCHEMA_VERSION
+from app.services.db import WriteTransaction, connect
+from app.services.session_aggregates import add_answer, aggregate_answers, session_aggregates
+from app.services.session_repository import (
+    SessionRepository,
+    content_version,
+    next_version,
+    session_version,
+)
+
+# Top-level session keys that have their own columns; everything else
+# goes to sessions.extra
+_SESSION_COLUMNS = ("session_id", "role", "seniority", "created_at", "version", "aggregates", "questions")
+_SCORE_COLUMNS = ("content_score", "structure_score", "clarity_score", "confidence_score")
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class SqliteSessionRepository(SessionRepository):
+    def __init__(self, path: str, busy_timeout_s: float = 30.0):
+        self.path = path
+        self.busy_timeout_s = busy_timeout_s
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # sqlite3 connections must not be shared across threads, and the
+        # routes call us from asyncio.to_thread workers
+        self._local = threading.local()
+        self._init_schema()
+
+    # ------------------------------------------------------------------
+    #  CONNECTIONS
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path, self.busy_timeout_s)
+        return conn
+
+    def _init_schema(self) -> None:
+        with self._write() as conn:
+            current = conn.execute("PRAGMA user_version").fetchone()[0]
+            fresh = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sessions'"
+            ).fetchone() is None
+
+            for statement in SCHEMA:
+                conn.execute(statement)
+            if not fresh:
+                for version in range(current + 1, SCHEMA_VERSION + 1):
+                    for statement in MIGRATIONS.get(version, []):
+                        conn.execute(statement)
+            conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def _write(self) -> "WriteTransaction":
+        return WriteTransaction(self._connect())
+
+    # ------------------------------------------------------------------
+    #  ROWS <-> SESSION DICTS
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _insert_answer(conn: sqlite3.Connection, session_id: str, position: int, answer: Dict[str, Any], created_at: float) -> None:
+        # Expression results get their own row; anything else stays in payload
+        expression = answer.get("expression")
+        if isinstance(expression, dict):
+            payload = {k: v for k, v in answer.items() if k != "expression"}
+        else:
+            payload, expression = answer, None
+
+        cursor = conn.execute(
+            """
+            INSERT INTO answers (session_id, position, question_id, content_score, structure_score,
+                                 clarity_score, confidence_score, created_at, payload)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                session_id,
+                position,
+                answer.get("question_id"),
+                *(_number(answer.get(col)) for col in _SCORE_COLUMNS),
+                created_at,
+                _dumps(payload),
+            ),
+        )
+
+        if expression is not None:
+            conn.execute(
+                """
+                INSERT INTO expressions (answer_id, dominant_emotion, frames_analyzed, face_frames, payload)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    cursor.lastrowid,
+                    expression.get("dominant_emotion"),
+                    expression.get("frames_analyzed"),
+                    expression.get("face_frames"),
+                    _dumps(expression),
+                ),
+            )
+
+    @staticmethod
+    def _load_answers(conn: sqlite3.Connection, session_id: str) -> List[Dict[str, Any]]:
+        rows = conn.execute(
+            """
+            SELECT a.payload AS answer, e.payload AS expression
+            FROM answers a LEFT JOIN expressions e ON e.answer_id = a.answer_id
+            WHERE a.session_id = ?
+            ORDER BY a.position
+            """,
+            (session_id,),
+        ).fetchall()
+
+        answers = []
+        for row in rows:
+            answer = json.loads(row["answer"])
+            if row["expression"] is not None:
+                answer["expression"] = json.loads(row["expression"])
+            answers.append(answer)
+        return answers
+
+    # ------------------------------------------------------------------
+    #  REPOSITORY
+    # ------------------------------------------------------------------
+
+    def create(self, session_data: Dict[str, Any]) -> None:
+        self.import_session(session_data)
+
+    def import_session(self, session_data: Dict[str, Any], replace: bool = False) -> bool:
+        """
+        Inserts a complete session, answers included (used by migrate-json).
+        Without `replace`, a session already in the database is left alone
+        and False is returned.
+        """
+        session_id = session_data["session_id"]
+        questions = session_data.get("questions", [])
+        created_at = session_data.get("created_at") or time.time()
+        extra = {k: v for k, v in session_data.items() if k not in _SESSION_COLUMNS}
+
+        with self._write() as conn:
+            if replace:
+                conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            cursor = conn.execute(
+                f"""
+                INSERT {"" if replace else "OR IGNORE "}INTO sessions (session_id, role, seniority, created_at, updated_at, version,
+                                      answer_count, aggregates, extra)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    session_id,
+                    session_data.get("role", ""),
+                    session_data.get("seniority", ""),
+                    created_at,
+                    time.time(),
+                    session_version(session_data),
+                    len(questions),
+                    _dumps(session_aggregates(session_data)),
+                    _dumps(extra),
+                ),
+            )
+            if cursor.rowcount == 0:
+                return False
+            for position, answer in enumerate(questions):
+                self._insert_answer(conn, session_id, position, answer, created_at)
+        return True
+
+    def exists(self, session_id: str) -> bool:
+        row = self._connect().execute("SELECT 1 FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return row is not None
+
+    def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        # One read transaction so the session row and its answers agree
+        conn.execute("BEGIN")
+        try:
+            row = conn.execute("SELECT * FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+            if row is None:
+                return None
+            questions = self._load_answers(conn, session_id)
+        finally:
+            conn.execute("COMMIT")
+
+        session_data = {
+            "session_id": row["session_id"],
+            "role": row["role"],
+            "seniority": row["seniority"],
+            "created_at": row["created_at"],
+            "version": row["version"],
+            "questions": questions,
+            **json.loads(row["extra"]),
+        }
+        if row["aggregates"] is not None:
+            session_data["aggregates"] = json.loads(row["aggregates"])
+        return session_data
+
+    def change_stamp(self, session_id: str) -> Optional[Hashable]:
+        row = self._connect().execute(
+            "SELECT updated_at, version FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return None if row is None else (row["updated_at"], row["version"])
+
+    def peek_version(self, session_id: str) -> Optional[str]:
+        row = self._connect().execute("SELECT version FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return None if row is None else row["version"]
+
+    def append_answer(self, session_id: str, answer: Dict[str, Any]) -> str:
+        now = time.time()
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT version, answer_count, aggregates FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                raise FileNotFoundError(f"Session not found: {session_id}")
+
+            if row["aggregates"] is not None:
+                aggregates = json.loads(row["aggregates"])
+            else:
+                # Session from before aggregates were stored: one full pass
+                aggregates = aggregate_answers(self._load_answers(conn, session_id))
+
+            version = next_version(row["version"], answer)
+            self._insert_answer(conn, session_id, row["answer_count"], answer, now)
+            conn.execute(
+                """
+                UPDATE sessions SET version = ?, answer_count = answer_count + 1, aggregates = ?, updated_at = ?
+                WHERE session_id = ?
+                """,
+                (version, _dumps(add_answer(aggregates, answer)), now, session_id),
+            )
+        return version
+
+    def update_fields(self, session_id: str, fields: Dict[str, Any], expected_version: Optional[str] = None) -> bool:
+        with self._write() as conn:
+            row = conn.execute("SELECT * FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+            if row is None:
+                raise FileNotFoundError(f"Session not found: {session_id}")
+
+            if expected_version is not None and row["version"] != expected_version:
+                return False
+
+            extra = json.loads(row["extra"])
+            columns = {"updated_at": time.time()}
+            for key, value in fields.items():
+                if key in ("role", "seniority", "created_at"):
+                    columns[key] = value
+                elif key in ("session_id", "version", "aggregates", "questions"):
+                    raise ValueError(f"{key} cannot be updated directly")
+                else:
+                    extra[key] = value
+            columns["extra"] = _dumps(extra)
+
+            assignments = ", ".join(f"{name} = ?" for name in columns)
+            conn.execute(
+                f"UPDATE sessions SET {assignments} WHERE session_id = ?",
+                (*columns.values(), session_id),
+            )
+        return True
+
+    def list_ids(self) -> List[str]:
+        rows = self._connect().execute("SELECT session_id FROM sessions ORDER BY session_id").fetchall()
+        return [row["session_id"] for row in rows]
+
+
+# ---------------------------------------------------------------------
+#  JSON IMPORT
+# ---------------------------------------------------------------------
+
+def iter_json_sessions(directory: str, skip: Optional[Callable[[str], bool]] = None) -> Iterable[Dict[str, Any]]:
+    """
+    Yields sessions stored by the file backend ({id}.json plus any answer
+    log), except those whose id `skip` returns True for (not even parsed).
+    Sessions without a stored version get their content hash, so cached
+    summaries/PDFs keyed by it stay valid after migrating.
+    """
+    from app.services.file_store import FileSessionRepository
+
+    files = FileSessionRepository(directory)
+    for session_id in files.list_ids():
+        if skip is not None and skip(session_id):
+            continue
+        session_data = files.load(session_id)
+        if session_data is None:
+            continue
+        session_data.setdefault("session_id", session_id)
+        session_data.setdefault("created_at", os.path.getmtime(files.header_path(session_id)))
+        session_data.setdefault("version", content_version(session_data.get("questions", [])))
+        yield session_data
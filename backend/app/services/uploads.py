@@ -0,0 +1,148 @@
+# backend/app/services/uploads.py
+#
+# Size-bounded, streaming file uploads. Request bodies over the limit are
+# refused by UploadLimitMiddleware before they are parsed; save_upload
+# then copies the parsed file to its destination in fixed-size chunks,
+# hashing on the way, and renames it into place only once complete.
+
+import os
+import json
+import uuid
+import asyncio
+import hashlib
+from typing import Dict, NamedTuple, Optional
+
+from fastapi import UploadFile
+
+from app.core.config import settings
+
+# Allowance for the multipart framing and form fields around the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadTooLargeError(Exception):
+    def __init__(self, limit: int):
+        super().__init__(f"Upload exceeds the {limit}-byte limit")
+        self.limit = limit
+
+
+class SavedUpload(NamedTuple):
+    path: str
+    size: int
+    sha256: str
+
+
+async def save_upload(upload: UploadFile, dest_path: str, max_bytes: int) -> SavedUpload:
+    """
+    Streams `upload` to `dest_path` in UPLOAD_CHUNK_BYTES chunks, so memory
+    use does not depend on the file size. The data goes to a temporary
+    file next to the destination and is renamed over it when complete:
+    readers never see a partial file, and a rejected or failed upload
+    leaves nothing behind. Raises UploadTooLargeError past `max_bytes`.
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLargeError(max_bytes)
+
+    directory = os.path.dirname(dest_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{os.path.basename(dest_path)}.{uuid.uuid4().hex}.part")
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            while True:
+                chunk = await upload.read(settings.UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                digest.update(chunk)
+                await asyncio.to_thread(f.write, chunk)
+        os.replace(tmp_path, dest_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    return SavedUpload(dest_path, size, digest.hexdigest())
+
+
+class UploadLimitMiddleware:
+    """
+    ASGI middleware that answers 413 for request bodies larger than the
+    limit configured for their path prefix: immediately when the
+    Content-Length says so, otherwise as soon as the streamed body
+    crosses the limit (chunked uploads), before the form is parsed.
+    """
+
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        # Longest prefix first, so specific paths win
+        self.limits = sorted(limits.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def _limit_for(self, path: str) -> Optional[int]:
+        for prefix, limit in self.limits:
+            if path.startswith(prefix):
+                return limit
+        return None
+
+    @staticmethod
+    async def _reject(send, limit: int) -> None:
+        body = json.dumps({"detail": f"Upload exceeds the {limit}-byte limit"}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT", "PATCH"):
+            return await self.app(scope, receive, send)
+
+        limit = self._limit_for(scope["path"])
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            return await self._reject(send, limit)
+
+        received = 0
+        rejected = False
+        started = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit and not rejected:
+                    rejected = True
+                    if not started:
+                        await self._reject(send, limit)
+                    raise UploadTooLargeError(limit)
+            return message
+
+        async def guarded_send(message):
+            nonlocal started
+            if rejected:
+                return  # the 413 has been sent; drop the app's error response
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except UploadTooLargeError:
+            if not rejected:
+                raise
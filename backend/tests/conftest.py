@@ -0,0 +1,10 @@
+# backend/tests/conftest.py
+
+import os
+import sys
+
+# Run from backend/ or the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app.services.llm_client refuses to import without a key; no test calls Gemini
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
@@ -0,0 +1,15 @@
+# backend/tests/pool_jobs.py
+#
+# Jobs for test_process_pool. They live in an importable module because
+# the pool's "spawn" workers unpickle them by name.
+
+import time
+
+
+def square(x):
+    return x * x
+
+
+def sleep_then(seconds, value):
+    time.sleep(seconds)
+    return value
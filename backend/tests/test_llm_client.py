@@ -0,0 +1,101 @@
+# backend/tests/test_llm_client.py
+
+import asyncio
+import time
+
+import pytest
+
+from app.services import llm_client
+from app.services.llm_client import AdaptiveLimiter, LLMDeadlineExceeded, RetryBudget
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class _SlowModel:
+    """Answers after `delay` seconds, counting the calls it gets."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+
+    async def generate_content_async(self, contents):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return _Response(f" {contents} ")
+
+
+def test_limiter_grows_slowly_and_halves_on_throttle():
+    async def scenario():
+        limiter = AdaptiveLimiter(initial=4, minimum=1, maximum=8)
+        for _ in range(4):
+            await limiter.acquire()
+            await limiter.release(throttled=False)
+        grown = limiter.limit
+        await limiter.acquire()
+        await limiter.release(throttled=True)
+        return grown, limiter.limit, limiter.in_flight
+
+    grown, throttled, in_flight = asyncio.run(scenario())
+    assert 4.9 < grown < 5.1  # about one slot per window of successes
+    assert throttled == pytest.approx(grown / 2)
+    assert in_flight == 0
+
+
+def test_limiter_never_leaves_its_bounds():
+    async def scenario():
+        limiter = AdaptiveLimiter(initial=2, minimum=2, maximum=3)
+        for _ in range(5):
+            await limiter.acquire()
+            await limiter.release(throttled=True)
+        low = limiter.limit
+        for _ in range(50):
+            await limiter.acquire()
+            await limiter.release(throttled=False)
+        return low, limiter.limit
+
+    assert asyncio.run(scenario()) == (2, 3)
+
+
+def test_retry_budget_is_a_fraction_of_calls():
+    budget = RetryBudget(ratio=0.5, max_tokens=1)
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    budget.deposit()
+    assert not budget.try_spend()
+    budget.deposit()
+    assert budget.try_spend()
+
+
+def test_limiter_wait_counts_against_the_timeout(monkeypatch):
+    limiter = AdaptiveLimiter(initial=1, minimum=1, maximum=1)
+    limiter.in_flight = 1  # every slot taken
+    monkeypatch.setattr(llm_client, "_limiter", limiter)
+    model = _SlowModel(delay=0)
+
+    async def scenario():
+        started = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            # The outer bound only keeps a regression from hanging the suite
+            await asyncio.wait_for(llm_client._attempt(model, "hi", timeout=0.2), 5)
+        return time.monotonic() - started
+
+    assert asyncio.run(scenario()) < 1
+    assert model.calls == 0
+    assert limiter.in_flight == 1
+
+
+def test_deadline_covers_all_attempts(monkeypatch):
+    monkeypatch.setattr(llm_client, "_limiter", AdaptiveLimiter(initial=2, minimum=1, maximum=2))
+    model = _SlowModel(delay=5)
+
+    async def scenario():
+        with pytest.raises(LLMDeadlineExceeded):
+            await llm_client._generate_with_retries(model, "hi", "test-deadline", deadline=0.2)
+        return await llm_client._generate_with_retries(_SlowModel(delay=0), "hi", "test-deadline", deadline=1)
+
+    assert asyncio.run(scenario()) == "hi"
+    assert model.calls == 1
+    assert llm_client.stats()["sites"]["test-deadline"]["deadline_exceeded"] == 1
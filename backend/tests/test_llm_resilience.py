@@ -0,0 +1,107 @@
+# backend/tests/test_llm_resilience.py
+
+import asyncio
+
+import pytest
+
+from app.services.llm_resilience import CircuitBreaker, CircuitOpenError, SiteResilience
+
+
+def _tripped(cooldown_s: float = 0.0) -> CircuitBreaker:
+    breaker = CircuitBreaker(error_rate=0.5, min_calls=4, window=4, cooldown_s=cooldown_s)
+    for ok in (True, False, True, False):
+        assert breaker.allow()
+        breaker.record(ok)
+    return breaker
+
+
+def test_breaker_opens_at_error_rate():
+    breaker = _tripped(cooldown_s=60)
+    assert breaker.state == "open"
+    assert breaker.trips == 1
+    assert not breaker.allow()
+
+
+def test_half_open_admits_one_probe():
+    breaker = _tripped()
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    probe = breaker.probe
+    assert not breaker.allow()
+
+    breaker.record(True, probe)
+    assert breaker.state == "closed"
+    assert breaker.error_rate_now() == 0.0
+
+
+def test_failed_probe_reopens():
+    breaker = _tripped()
+    breaker.allow()
+    breaker.record(False, breaker.probe)
+    assert breaker.probe is None
+    assert breaker.trips == 1
+    assert breaker.allow()  # cooldown 0: half-open again straight away
+
+
+def test_late_outcomes_do_not_decide_half_open():
+    breaker = _tripped()
+    breaker.allow()
+    probe = breaker.probe
+
+    # Calls admitted before the trip finish while the probe is in flight
+    breaker.record(True)
+    breaker.record(False)
+    assert breaker.state == "half_open"
+    assert breaker.probe == probe
+
+    # A released probe's outcome no longer counts either
+    breaker.release_probe(probe)
+    breaker.allow()
+    breaker.record(True, probe)
+    assert breaker.state == "half_open"
+    breaker.record(True, breaker.probe)
+    assert breaker.state == "closed"
+
+
+def test_open_site_rejects_without_calling():
+    site = SiteResilience("test", {"breaker_min_calls": 2, "breaker_window": 2, "breaker_cooldown_s": 60})
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("upstream down")
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await site.run(failing)
+        with pytest.raises(CircuitOpenError):
+            await site.run(failing)
+
+    asyncio.run(scenario())
+    assert calls == 2
+    assert site.rejected == 1
+    assert site.stats()["breaker_state"] == "open"
+
+
+def test_cancelled_hedged_call_cancels_its_requests():
+    site = SiteResilience("test", {"hedge": True, "breaker": False})
+    started = []
+
+    async def slow():
+        task = asyncio.current_task()
+        started.append(task)
+        await asyncio.sleep(60)
+
+    async def scenario():
+        caller = asyncio.ensure_future(site._hedged(slow, delay=30))
+        await asyncio.sleep(0.05)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0)
+        # Checked before asyncio.run() cancels whatever is left over
+        return [task.cancelled() for task in started]
+
+    assert asyncio.run(scenario()) == [True]
@@ -0,0 +1,49 @@
+# backend/tests/test_process_pool.py
+
+import asyncio
+
+import pytest
+
+from app.services.process_pool import JobTimeoutError, ManagedProcessPool
+from tests import pool_jobs
+
+
+def test_timeout_recycles_pool():
+    async def scenario():
+        pool = ManagedProcessPool("test", 1, default_timeout=30)
+        pool.start()
+        try:
+            first = pool._executor
+            with pytest.raises(JobTimeoutError):
+                await pool.run(pool_jobs.sleep_then, 30, "late", timeout=1)
+            assert pool._executor is not first
+            assert await pool.run(pool_jobs.square, 7) == 49
+            return pool.stats()
+        finally:
+            pool.shutdown()
+
+    stats = asyncio.run(scenario())
+    assert stats["timeouts"] == 1
+    assert stats["recycles"] == 1
+
+
+def test_job_queued_behind_hung_job_is_retried():
+    async def scenario():
+        pool = ManagedProcessPool("test", 1, default_timeout=30)
+        pool.start()
+        try:
+            # One worker: the other jobs wait behind the first, some in the
+            # executor's call queue and some still pending in the executor
+            hung = asyncio.ensure_future(pool.run(pool_jobs.sleep_then, 30, "late", timeout=2))
+            await asyncio.sleep(0.1)
+            queued = [asyncio.ensure_future(pool.run(pool_jobs.square, n)) for n in range(4)]
+            with pytest.raises(JobTimeoutError):
+                await hung
+            assert await asyncio.gather(*queued) == [0, 1, 4, 9]
+            return pool.stats()
+        finally:
+            pool.shutdown()
+
+    stats = asyncio.run(scenario())
+    assert stats["timeouts"] == 1
+    assert stats["retries"] == 4
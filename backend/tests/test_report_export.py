@@ -0,0 +1,88 @@
+# backend/tests/test_report_export.py
+
+import asyncio
+import io
+import zipfile
+
+import pytest
+
+# report_service reaches the video pipeline through executors, which needs fer
+pytest.importorskip("fer")
+
+from app.core.config import settings  # noqa: E402
+from app.services import report_export  # noqa: E402
+
+
+class _TrackedFile(io.BytesIO):
+    open_files = 0
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        _TrackedFile.open_files += 1
+
+    def close(self):
+        if not self.closed:
+            _TrackedFile.open_files -= 1
+        super().close()
+
+
+def _fake_render(monkeypatch, missing=()):
+    """Renders "%PDF <id>" for every session except `missing`; returns stats."""
+    seen = {"renders": 0, "max_renders": 0, "max_open": 0}
+
+    def load_session(session_id):
+        return None if session_id in missing else {"session_id": session_id}
+
+    async def get_report_pdf(session_id, session_data, template):
+        seen["renders"] += 1
+        seen["max_renders"] = max(seen["max_renders"], seen["renders"])
+        await asyncio.sleep(0.01)
+        seen["renders"] -= 1
+        pdf = _TrackedFile(f"%PDF {session_id}".encode())
+        seen["max_open"] = max(seen["max_open"], _TrackedFile.open_files)
+        return {}, pdf
+
+    monkeypatch.setattr(report_export, "load_session", load_session)
+    monkeypatch.setattr(report_export, "get_report_pdf", get_report_pdf)
+    return seen
+
+
+async def _collect(stream) -> bytes:
+    chunks = []
+    async for chunk in stream:
+        chunks.append(chunk)
+        await asyncio.sleep(0.01)  # a slow client: renders must not pile up
+    return b"".join(chunks)
+
+
+def test_zip_contains_every_report_and_errors(monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_CONCURRENCY", 3)
+    seen = _fake_render(monkeypatch, missing={"s7"})
+    ids = [f"s{i}" for i in range(20)]
+
+    data = asyncio.run(_collect(report_export.stream_reports_zip(ids)))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        names = set(archive.namelist())
+        assert names == {f"interview-report-{sid}.pdf" for sid in ids if sid != "s7"} | {"errors.txt"}
+        assert archive.read("interview-report-s3.pdf") == b"%PDF s3"
+        assert archive.read("errors.txt") == b"s7: session not found\n"
+
+    # A bounded window of renders, and every file closed once written
+    assert seen["max_renders"] <= 3
+    assert seen["max_open"] <= 3
+    assert _TrackedFile.open_files == 0
+
+
+def test_abandoned_export_closes_rendered_files(monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_CONCURRENCY", 4)
+    _fake_render(monkeypatch)
+
+    async def scenario():
+        stream = report_export.stream_reports_zip([f"s{i}" for i in range(20)])
+        await stream.__anext__()  # the client reads one chunk and goes away
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+    assert _TrackedFile.open_files == 0
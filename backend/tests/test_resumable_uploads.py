@@ -0,0 +1,71 @@
+# backend/tests/test_resumable_uploads.py
+
+import asyncio
+import hashlib
+import os
+import time
+
+import pytest
+
+from app.services.resumable_uploads import ResumableUploads, UploadNotFoundError, UploadOffsetError
+
+
+async def _chunks(*parts):
+    for part in parts:
+        yield part
+
+
+def _age(uploads, session_id, upload_id, seconds):
+    """Backdates an upload's files as if untouched for `seconds`."""
+    then = time.time() - seconds
+    for path in uploads._paths(session_id, upload_id):
+        os.utime(path, (then, then))
+
+
+def test_resume_and_finalize(tmp_path):
+    uploads = ResumableUploads(str(tmp_path))
+    upload = uploads.create("s1", "q1", "Tell me about yourself", size=6)
+    upload_id = upload["upload_id"]
+
+    async def scenario():
+        offset = await uploads.append("s1", upload_id, 0, _chunks(b"abc"))
+        with pytest.raises(UploadOffsetError) as excinfo:
+            await uploads.append("s1", upload_id, 0, _chunks(b"abc"))
+        assert excinfo.value.offset == offset
+        await uploads.append("s1", upload_id, offset, _chunks(b"def"))
+        return await uploads.finalize("s1", upload_id, str(tmp_path / "s1" / "q1.webm"))
+
+    meta, saved = asyncio.run(scenario())
+    assert meta["question_id"] == "q1"
+    assert saved.size == 6
+    assert saved.sha256 == hashlib.sha256(b"abcdef").hexdigest()
+    assert os.listdir(tmp_path / "s1") == ["q1.webm"]
+
+
+def test_expire_deletes_only_idle_uploads(tmp_path):
+    uploads = ResumableUploads(str(tmp_path), ttl_s=60)
+    idle = uploads.create("s1", "q1", "Q1")["upload_id"]
+    active = uploads.create("s1", "q2", "Q2")["upload_id"]
+    _age(uploads, "s1", idle, 120)
+    _age(uploads, "s1", active, 120)
+
+    # Appending counts as activity
+    asyncio.run(uploads.append("s1", active, 0, _chunks(b"data")))
+
+    assert uploads.expire() == 1
+    with pytest.raises(UploadNotFoundError):
+        uploads.status("s1", idle)
+    assert uploads.status("s1", active)["offset"] == 4
+    assert idle not in uploads._digests
+    assert sorted(os.listdir(tmp_path / "s1")) == sorted([f".{active}.json", f".{active}.part"])
+
+
+def test_create_sweeps_abandoned_uploads(tmp_path):
+    uploads = ResumableUploads(str(tmp_path), ttl_s=60)
+    abandoned = uploads.create("s1", "q1", "Q1")["upload_id"]
+    _age(uploads, "s1", abandoned, 120)
+    uploads._last_sweep = 0.0
+
+    uploads.create("s2", "q1", "Q1")
+    with pytest.raises(UploadNotFoundError):
+        uploads.status("s1", abandoned)
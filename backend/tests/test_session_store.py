@@ -0,0 +1,136 @@
+# backend/tests/test_session_store.py
+
+import json
+import time
+
+import pytest
+
+from app.services.file_store import FileSessionRepository
+from app.services.session_aggregates import empty_aggregates
+from app.services.session_repository import content_version, next_version
+from app.services.sqlite_store import SqliteSessionRepository, iter_json_sessions
+
+
+def _session(session_id="s1"):
+    return {
+        "session_id": session_id,
+        "role": "Backend Engineer",
+        "seniority": "Senior",
+        "created_at": time.time(),
+        "version": content_version([]),
+        "aggregates": empty_aggregates(),
+        "questions": [],
+    }
+
+
+def _answer(i):
+    return {
+        "question_id": f"q{i}",
+        "transcript": f"answer {i}",
+        "content_score": i,
+        "structure_score": 5,
+        "clarity_score": 6,
+        "confidence_score": 7,
+        "expression": {"dominant_emotion": "neutral", "emotion_scores": {"neutral": 0.9}, "face_frames": 3},
+    }
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def repository(request, tmp_path):
+    if request.param == "json":
+        return FileSessionRepository(str(tmp_path / "sessions"), fsync="never", compact_bytes=512)
+    return SqliteSessionRepository(str(tmp_path / "sessions.db"))
+
+
+def test_create_append_load(repository):
+    repository.create(_session())
+    assert repository.exists("s1")
+    assert not repository.exists("missing")
+    assert repository.load("missing") is None
+
+    version = content_version([])
+    for i in range(5):
+        version = next_version(version, _answer(i))
+        assert repository.append_answer("s1", _answer(i)) == version
+
+    session_data = repository.load("s1")
+    assert [q["question_id"] for q in session_data["questions"]] == [f"q{i}" for i in range(5)]
+    assert session_data["questions"][2]["expression"]["dominant_emotion"] == "neutral"
+    assert session_data["version"] == version
+    assert repository.peek_version("s1") == version
+    assert session_data["aggregates"]["answers"] == 5
+    assert session_data["aggregates"]["score_sums"]["content_score"] == 10
+
+
+def test_update_fields(repository):
+    repository.create(_session())
+    stamp = repository.change_stamp("s1")
+    assert repository.update_fields("s1", {"status": "completed"})
+    assert repository.load("s1")["status"] == "completed"
+    assert repository.change_stamp("s1") != stamp
+
+    # A stale expected_version writes nothing
+    repository.append_answer("s1", _answer(0))
+    assert not repository.update_fields("s1", {"summary": "x"}, expected_version=content_version([]))
+    assert "summary" not in repository.load("s1")
+
+
+def test_migrate_json_to_sqlite(tmp_path):
+    directory = tmp_path / "sessions"
+    files = FileSessionRepository(str(directory), fsync="never")
+    files.create(_session("a"))
+    for i in range(3):
+        files.append_answer("a", _answer(i))
+
+    # Legacy file: no version, created_at or aggregates
+    legacy = {"session_id": "b", "role": "Designer", "seniority": "Junior", "questions": [_answer(1)]}
+    (directory / "b.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    database = SqliteSessionRepository(str(tmp_path / "sessions.db"))
+    for session_data in iter_json_sessions(str(directory)):
+        assert database.import_session(session_data)
+
+    assert database.list_ids() == ["a", "b"]
+    assert database.load("a")["questions"] == files.load("a")["questions"]
+    assert database.peek_version("a") == files.peek_version("a")
+    assert database.peek_version("b") == content_version(legacy["questions"])
+    assert database.load("b")["aggregates"]["answers"] == 1
+
+    # Already imported: skipped without being parsed, and not overwritten
+    assert list(iter_json_sessions(str(directory), skip=database.exists)) == []
+    assert not database.import_session(files.load("a"))
+    database.append_answer("b", _answer(2))
+    assert len(database.load("b")["questions"]) == 2
+
+
+def test_torn_log_tail_is_dropped(tmp_path):
+    files = FileSessionRepository(str(tmp_path), fsync="never")
+    files.create(_session())
+    files.append_answer("s1", _answer(0))
+
+    # A crash after writing a complete entry but before its newline
+    version = files.peek_version("s1")
+    torn = {"position": 1, "version": next_version(version, _answer(9)), "answer": _answer(9)}
+    with open(files.log_path("s1"), "ab") as f:
+        f.write(json.dumps(torn).encode("utf-8"))
+
+    assert files.peek_version("s1") == version
+    files.append_answer("s1", _answer(1))
+    assert [q["question_id"] for q in files.load("s1")["questions"]] == ["q0", "q1"]
+
+
+def test_corrupt_last_log_line_is_skipped(tmp_path):
+    files = FileSessionRepository(str(tmp_path), fsync="never")
+    files.create(_session())
+    files.append_answer("s1", _answer(0))
+    version = files.peek_version("s1")
+
+    # A complete but garbled line, e.g. from a disk error
+    with open(files.log_path("s1"), "ab") as f:
+        f.write(b'{"position": 1, "vers\x00\n')
+
+    assert files.peek_version("s1") == version
+    files.append_answer("s1", _answer(1))
+    session_data = files.load("s1")
+    assert [q["question_id"] for q in session_data["questions"]] == ["q0", "q1"]
+    assert files.peek_version("s1") == session_data["version"]